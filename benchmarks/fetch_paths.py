@@ -0,0 +1,90 @@
+"""Compare `pd.read_sql` with the connector's Arrow-native fetch paths on the Monitoring page tables.
+
+Run from the repository root with Snowflake secrets in `.streamlit/secrets.toml`:
+
+    python -m benchmarks.fetch_paths --repeat 3
+"""
+import argparse
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+
+from data_layer.connection import connection
+from data_layer.sql import DIALECTS, Select, UnionAll, col, compile_query, gt, literal
+from data_layer.transfers import SERVICE_SPECS, date_params, fetch_frame
+
+# --- Monitoring page tables over the flattened union ------------------------------------------------------------
+UNION = UnionAll(*SERVICE_SPECS.values())
+NEWEST_FIRST = ((col("created_at"), True),)
+TABLE_QUERIES = {
+    "whale transfers": Select(UNION, where=(gt(col("amount"), literal(100000)),), order_by=NEWEST_FIRST),
+    "recent transfers": Select(UNION, order_by=NEWEST_FIRST, limit=1000),
+}
+
+
+def read_sql(conn, query, params):
+    with warnings.catch_warnings():
+        # pandas warns about non-SQLAlchemy DB-API connections
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.read_sql(query, conn, params=params)
+
+
+def fetch_pandas_all(conn, query, params):
+    with conn.cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetch_pandas_all()
+
+
+FETCH_PATHS = {
+    "pd.read_sql": read_sql,
+    "fetch_pandas_all": fetch_pandas_all,
+    # What the loaders use: fetch_arrow_all, then one Table.to_pandas
+    "fetch_frame": fetch_frame,
+}
+
+
+def measure(fetch, conn, query, params):
+    tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    wall, cpu = time.perf_counter(), time.process_time()
+    df = fetch(conn, query, params)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(df),
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "python_peak_mb": python_peak / 2**20,
+        "arrow_mb": max(pa.total_allocated_bytes() - arrow_before, 0) / 2**20,
+        "frame_mb": df.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--end-date", default="2025-07-31")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    with connection() as conn:
+        # Snowflake's result cache serves repeats, so every path measures transfer and decode only
+        conn.cursor().execute("ALTER SESSION SET USE_CACHED_RESULT = TRUE")
+        params = date_params(args.start_date, args.end_date)
+        for table, spec in TABLE_QUERIES.items():
+            query = compile_query(spec, DIALECTS["snowflake"])
+            for path, fetch in FETCH_PATHS.items():
+                for run in range(args.repeat):
+                    results.append({"table": table, "path": path, "run": run, **measure(fetch, conn, query, params)})
+
+    report = pd.DataFrame(results).groupby(["table", "path"]).median(numeric_only=True).drop(columns="run")
+    print(report.round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
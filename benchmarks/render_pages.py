@@ -0,0 +1,177 @@
+"""Render every dashboard page headlessly against a stub backend and report where the time goes.
+
+    python -m benchmarks.render_pages --rows 200000 --repeat 3
+
+Each page runs through Streamlit's AppTest twice per repeat: cold (empty caches and an empty transfer store) and
+warm (an immediate rerun). For every run it reports wall time, warehouse query count, rows decoded, and peak
+Python memory, split per section: each data-layer call the page makes (inclusive of nested calls, shown at a
+deeper `depth`), plus the remaining chart/table rendering.
+"""
+import argparse
+import functools
+import os
+
+# Keep Streamlit's own log chatter out of the report
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+# Cold runs measure an unwarmed cache
+os.environ.setdefault("AXELAR_WARM_CACHE", "0")
+
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from data_layer import aggregations, lookup, rollups, store
+from data_layer.fixtures import synthetic_transfers
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["🏠Home.py", *sorted(str(p.relative_to(ROOT)) for p in ROOT.glob("pages/*.py"))]
+SECTION_MODULES = [store, rollups, aggregations, lookup]
+
+
+class StubBackend:
+    """Answers transfer fetches from in-memory fixture frames and counts what was asked for."""
+
+    name = "stub"
+
+    def __init__(self, rows, start_date, end_date):
+        self.frame = synthetic_transfers(rows, start_date, end_date)
+        self.dates = self.frame["created_at"].dt.date
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.rows_decoded = 0
+
+    def fetch_transfers(self, start_date, end_date, service):
+        mask = (self.frame["service"] == service) & (self.dates >= start_date) & (self.dates <= end_date)
+        rows = self.frame[mask].copy()
+        with self._lock:
+            self.queries += 1
+            self.rows_decoded += len(rows)
+        return rows
+
+
+class SectionTimer:
+    """Wraps the data-layer callables a page uses and records inclusive time and peak memory per call."""
+
+    def __init__(self):
+        self.records = []
+        self._depth = threading.local()
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            depth = getattr(self._depth, "value", 0)
+            self._depth.value = depth + 1
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                start_memory, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1] - start_memory if tracing else 0
+                self._depth.value = depth
+                self.records.append({"section": name, "depth": depth, "seconds": elapsed, "peak_mb": peak / 2**20})
+
+        return timed
+
+    def patches(self, page_source):
+        for module in SECTION_MODULES:
+            for name, obj in vars(module).items():
+                if (
+                    callable(obj)
+                    and not name.startswith("_")
+                    and getattr(obj, "__module__", None) == module.__name__
+                    and re.search(rf"\b{name}\b", page_source)
+                ):
+                    yield mock.patch.object(module, name, self.wrap(name, obj))
+
+
+def render(page, backend, timer, timeout, trace_memory=True):
+    """Run a page cold and then warm; yield one result row per run."""
+    source = (ROOT / page).read_text(encoding="utf-8")
+    patches = list(timer.patches(source))
+    for patch in patches:
+        patch.start()
+    try:
+        at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+        for phase in ("cold", "warm"):
+            backend.reset()
+            timer.records.clear()
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            at.run()
+            wall = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if at.exception:
+                raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+            sections = pd.DataFrame(timer.records, columns=["section", "depth", "seconds", "peak_mb"])
+            top_level = sections.loc[sections["depth"] == 0, "seconds"].sum()
+            yield {
+                "page": page,
+                "phase": phase,
+                "wall_s": wall,
+                "queries": backend.queries,
+                "rows_decoded": backend.rows_decoded,
+                "peak_mb": peak / 2**20,
+                "sections": pd.concat(
+                    [sections, pd.DataFrame([{"section": "render", "depth": 0, "seconds": wall - top_level}])],
+                    ignore_index=True,
+                ),
+            }
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="fixture rows per service")
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--end-date", default="2025-07-31")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--pages", nargs="*", default=PAGES)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows Python code down")
+    args = parser.parse_args()
+
+    backend = StubBackend(args.rows, pd.Timestamp(args.start_date).date(), pd.Timestamp(args.end_date).date())
+    timer = SectionTimer()
+    runs, sections = [], []
+    with mock.patch.object(store, "get_backend", lambda: backend):
+        for repeat in range(args.repeat):
+            for page in args.pages:
+                with tempfile.TemporaryDirectory() as store_path, mock.patch.dict(os.environ, AXELAR_STORE_PATH=store_path):
+                    st.cache_data.clear()
+                    st.cache_resource.clear()
+                    for result in render(page, backend, timer, args.timeout, not args.no_memory):
+                        section_frame = result.pop("sections")
+                        section_frame[["page", "phase", "repeat"]] = result["page"], result["phase"], repeat
+                        sections.append(section_frame)
+                        runs.append({**result, "repeat": repeat})
+
+    pd.set_option("display.width", 200)
+    print(f"Fixture: {len(backend.frame):,} rows, {args.start_date}..{args.end_date}\n")
+    print(pd.DataFrame(runs).groupby(["page", "phase"], sort=False).median(numeric_only=True).drop(columns="repeat")
+          .round(3).to_string())
+    print()
+    per_section = pd.concat(sections, ignore_index=True).groupby(["page", "phase", "section", "depth"], sort=False)
+    print(per_section[["seconds", "peak_mb"]].median().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# --- Shared data layer for the dashboard pages ---
+# Pages fetch flattened transfer rows once and derive their tables and charts
+# locally instead of issuing one warehouse query per chart.
@@ -0,0 +1,112 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from data_layer.shared_cache import file_lock
+
+# --- Address normalization and the persistent address -> id index -------------------------------------------------
+# Token transfers report `sender_address`, GMP calls `data:call:transaction:from`, and the same EVM wallet shows up
+# in both with different casing. Addresses are normalized once when rows are conformed: surrounding whitespace is
+# dropped and hex addresses, which are case-insensitive, are lower-cased. Other formats (bech32, base58) are kept.
+#
+# Every normalized address gets a dense integer id the first time it is seen. Ids are assigned in order, never
+# reused and saved next to the store's partitions, so they stay the same across restarts and for every process
+# sharing the store; user counts and rankings then work on int32 arrays instead of strings.
+HEX_ADDRESS = r"^0[xX][0-9a-fA-F]{40}$"
+INDEX_FILE = "addresses.parquet"
+
+
+def normalize_addresses(values):
+    """Normalized addresses of a Series of strings; missing values stay missing."""
+    values = pd.Series(values, dtype=object).str.strip()
+    is_hex = values.str.match(HEX_ADDRESS, na=False)
+    return values.where(~is_hex, values.str.lower())
+
+
+def normalize_address_column(column):
+    """`normalize_addresses` for a categorical column: each distinct address is normalized once and addresses
+    that become equal share one category."""
+    categories = normalize_addresses(column.cat.categories).to_numpy(dtype=object)
+    normalized, codes = np.unique(categories, return_inverse=True)
+    remap = np.append(codes.astype(np.int32), -1)
+    codes = remap[column.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, normalized), index=column.index, name=column.name)
+
+
+class AddressIndex:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._addresses = pd.Index([], dtype=object)
+        self._reload()
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def _reload(self):
+        try:
+            addresses = pq.read_table(self.path).column("address").to_pylist()
+        except FileNotFoundError:
+            addresses = []
+        if len(addresses) >= len(self._addresses):
+            self._addresses = pd.Index(addresses, dtype=object)
+
+    def _add(self, new):
+        """Assign ids to `new` addresses under the store's lock, picking up ids other processes assigned first."""
+        with self._lock, file_lock(f"{self.path}.lock"):
+            self._reload()
+            new = pd.Index(new).difference(self._addresses)
+            if len(new):
+                self._addresses = self._addresses.append(pd.Index(new, dtype=object))
+                tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                pq.write_table(pa.table({"address": pa.array(self._addresses.to_numpy(), pa.string())}), tmp)
+                os.replace(tmp, self.path)
+
+    def lookup(self, addresses):
+        """Ids of normalized addresses as an int32 array, -1 where an address is missing or unknown."""
+        return self._addresses.get_indexer(pd.Index(addresses, dtype=object)).astype(np.int32)
+
+    def ids(self, addresses):
+        """Ids of a Series of normalized addresses as an int32 array, assigning ids to new ones; -1 where missing.
+
+        A categorical column is looked up once per category.
+        """
+        addresses = pd.Series(addresses)
+        if isinstance(addresses.dtype, pd.CategoricalDtype):
+            category_ids = self.ids(pd.Series(addresses.cat.categories, dtype=object))
+            return np.append(category_ids, np.int32(-1))[addresses.cat.codes.to_numpy()]
+        ids = self.lookup(addresses)
+        unknown = (ids < 0) & addresses.notna().to_numpy()
+        if unknown.any():
+            self._add(addresses[unknown].unique())
+            ids = self.lookup(addresses)
+        return ids
+
+    def addresses(self, ids):
+        """The addresses behind an array of ids."""
+        return self._addresses.to_numpy()[np.asarray(ids)]
+
+
+@st.cache_resource
+def get_address_index():
+    from data_layer.store import get_store
+
+    return AddressIndex(str(get_store().root / INDEX_FILE))
+
+
+def distinct_per_group(groups, values, n_groups):
+    """How many distinct non-negative `values` each group in `range(n_groups)` has, from two integer arrays.
+
+    Negative group codes or values (missing) are skipped.
+    """
+    groups, values = np.asarray(groups), np.asarray(values)
+    keep = (groups >= 0) & (values >= 0)
+    pairs = np.sort((groups[keep].astype(np.int64) << 32) | values[keep].astype(np.int64))
+    first = np.ones(len(pairs), dtype=bool)
+    first[1:] = pairs[1:] != pairs[:-1]
+    return np.bincount((pairs[first] >> 32).astype(np.intp), minlength=n_groups)
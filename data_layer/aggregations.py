@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+
+from data_layer.addresses import distinct_per_group, get_address_index
+from data_layer.cache import cached_loader
+from data_layer.instrumentation import instrumented
+from data_layer.store import load_axelar_services
+
+# --- Local aggregation engine over the flattened transfer rows ---------------------------------------------------
+# Mirrors the SQL the pages used to run per chart: COUNT(DISTINCT ...) -> nunique, SUM/AVG/MEDIAN/MAX skip NULLs.
+# Distinct users are counted on the address index's integer ids rather than on the address strings.
+#
+# The `load_*` loaders cache each page's aggregates per (start, end), so a rerun for any other widget is a hit.
+PATH_SEPARATOR = "➡"
+DIRECTION_FROM_FILECOIN = "filecoin➡⛓"
+DIRECTION_TO_FILECOIN = "⛓➡filecoin"
+
+
+def with_path(df):
+    """Add the `source_chain || '➡' || destination_chain` column (NULL if either side is NULL)."""
+    df = df.copy()
+    df["path"] = df["source_chain"].str.cat(df["destination_chain"], sep=PATH_SEPARATOR)
+    return df
+
+
+def path_codes(df):
+    """Integer codes standing for the rows' paths, -1 where `with_path` gives NULL."""
+    source, _ = pd.factorize(df["source_chain"])
+    destination, destinations = pd.factorize(df["destination_chain"])
+    return np.where((source < 0) | (destination < 0), -1, source * len(destinations) + destination)
+
+
+def user_ids(df):
+    """The rows' user ids from the address index, -1 where the user is missing."""
+    return get_address_index().ids(df["user"])
+
+
+def distinct_users(grouped, df):
+    """COUNT(DISTINCT user) for each group of `grouped`, a groupby over `df`, in the groups' order."""
+    return distinct_per_group(grouped.ngroup().to_numpy(), user_ids(df), grouped.ngroups)
+
+
+def truncate_dates(dates, timeframe):
+    """Vectorized DATE_TRUNC for 'day', 'week' (Monday start) and 'month'."""
+    if timeframe == "day":
+        return dates.dt.floor("D")
+    if timeframe == "week":
+        return dates.dt.to_period("W").dt.start_time
+    if timeframe == "month":
+        return dates.dt.to_period("M").dt.start_time
+    raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def direction_of(df):
+    return pd.Series(
+        np.select(
+            [df["source_chain"] == "filecoin", df["destination_chain"] == "filecoin"],
+            [DIRECTION_FROM_FILECOIN, DIRECTION_TO_FILECOIN],
+            default=None,
+        ),
+        index=df.index,
+        dtype=object,
+    )
+
+
+# --- Analysis of Paths page ------------------------------------------------------------------------------------
+@instrumented
+def transfer_paths_table(df):
+    df = with_path(df)
+    grouped = df.groupby("path", dropna=False, sort=False)
+    out = grouped.agg(
+        **{
+            "🚀Transfer Count": ("id", "nunique"),
+            "💰Transfer Volume ($USD)": ("amount", "sum"),
+            "💸Transfer Fees ($USD)": ("fee", "sum"),
+            "📊Avg Fee ($USD)": ("fee", "mean"),
+        }
+    )
+    out.insert(0, "👥User Count", distinct_users(grouped, df))
+    out = out.round({"💰Transfer Volume ($USD)": 0, "💸Transfer Fees ($USD)": 0, "📊Avg Fee ($USD)": 2})
+    out = out.sort_values("🚀Transfer Count", ascending=False)
+    return out.rename_axis("🔀Path").reset_index()
+
+
+@instrumented
+def chain_distribution(df):
+    """Volume, transfer count and user count per source chain (into Filecoin) and per destination chain
+    (out of Filecoin), computed in a single grouped pass over both sides."""
+    inbound = df[df["destination_chain"] == "filecoin"].assign(side="Source Chain", chain=lambda d: d["source_chain"])
+    outbound = df[df["source_chain"] == "filecoin"].assign(side="Destination Chain", chain=lambda d: d["destination_chain"])
+    both = pd.concat([inbound, outbound], ignore_index=True)
+    grouped = both.groupby(["side", "chain"], sort=False, observed=True)
+    out = grouped.agg(
+        **{
+            "Transfer Volume": ("amount", lambda amounts: amounts.sum(min_count=1)),
+            "Transfer Count": ("id", "nunique"),
+        }
+    )
+    out["User Count"] = distinct_users(grouped, both)
+    return out.reset_index()
+
+
+@cached_loader
+def load_transfer_paths_table(start_date, end_date):
+    return transfer_paths_table(load_axelar_services(start_date, end_date))
+
+
+@cached_loader
+def load_chain_distribution(start_date, end_date):
+    return chain_distribution(load_axelar_services(start_date, end_date))
+
+
+def chain_measure(distribution, side, measure):
+    """One pie's worth of `chain_distribution`: `side` is "Source Chain" or "Destination Chain"."""
+    out = distribution[distribution["side"] == side]
+    if measure == "Transfer Volume":
+        # Volume pies skip chains without priced transfers and Filecoin-to-Filecoin self transfers
+        out = out[out[measure].notna()]
+        if side == "Source Chain":
+            out = out[out["chain"] != "filecoin"]
+        out = out.assign(**{measure: out[measure].round(2)})
+    out = out.sort_values(measure, ascending=False)
+    return out[["chain", measure]].rename(columns={"chain": side}).reset_index(drop=True)
+
+
+# --- Monitoring Transfers & Users page -------------------------------------------------------------------------
+@instrumented
+def transfer_rows(df):
+    """The transfer explorer's columns for already ordered rows."""
+    df = with_path(df)
+    return pd.DataFrame(
+        {
+            "⏰Date": df["created_at"],
+            "👥Asset Sender": df["user"],
+            "🔀Path": df["path"],
+            "💰Amount ($USD)": df["amount"].round(1).astype(str).where(df["amount"].notna(), "No Volume"),
+            "💸Transfer Fee ($USD)": df["fee"].round(5),
+            "⛓ID": df["id"],
+        }
+    ).reset_index(drop=True)
+
+
+@instrumented
+def whale_transfers(df, threshold=100000):
+    df = with_path(df[df["amount"] > threshold])
+    df = df.sort_values("created_at", ascending=False, kind="stable")
+    return pd.DataFrame(
+        {
+            "⏰Date": df["created_at"].dt.date,
+            "🐳Asset Sender": df["user"],
+            "🔀Path": df["path"],
+            "💰Amount ($USD)": df["amount"].round(1),
+            "💸Transfer Fee ($USD)": df["fee"].round(3),
+            "⛓ID": df["id"],
+        }
+    ).reset_index(drop=True)
+
+
+@cached_loader
+def load_whale_transfers(start_date, end_date):
+    return whale_transfers(load_axelar_services(start_date, end_date))
+
+
+class UserRanking:
+    """Per-user volume, transfer count, fees and paths over priced transfers, computed once on integer arrays:
+    users are grouped by their address index id, sums are bincounts and distinct counts pack (user, value) pairs.
+
+    `top(metric, n)` ranks by any metric column; each metric's descending order is sorted on first use and
+    reused, so extra rankings or a larger N cost a slice rather than another aggregation.
+    """
+
+    @instrumented(name="UserRanking")
+    def __init__(self, df):
+        priced = df[df["amount"].notna()]
+        users = user_ids(priced)
+        known = users >= 0
+        priced = priced[known]
+        ids, groups = np.unique(users[known], return_inverse=True)
+        n = len(ids)
+        table = pd.DataFrame(
+            {
+                "User": get_address_index().addresses(ids),
+                "Volume of Transfers": np.bincount(groups, weights=priced["amount"].to_numpy(), minlength=n),
+                "Number of Transfers": distinct_per_group(groups, pd.factorize(priced["id"])[0], n),
+                "Transfer Fees": np.bincount(groups, weights=priced["fee"].fillna(0).to_numpy(), minlength=n),
+                "Number of Paths": distinct_per_group(groups, path_codes(priced), n),
+            }
+        )
+        self.table = table.round({"Volume of Transfers": 1, "Transfer Fees": 1})
+        self._order = {}
+
+    def top(self, metric, n=5):
+        order = self._order.get(metric)
+        if order is None:
+            values = self.table[metric].to_numpy(dtype="float64", na_value=-np.inf)
+            order = np.argsort(-values, kind="stable")
+            self._order[metric] = order
+        return self.table.iloc[order[:n]].reset_index(drop=True)
+
+    @property
+    def nbytes(self):
+        return int(self.table.memory_usage(index=True, deep=True).sum())
+
+
+@cached_loader
+def load_user_ranking(start_date, end_date):
+    return UserRanking(load_axelar_services(start_date, end_date))
+
+
+# --- Wallet Lookup page ---------------------------------------------------------------------------------------------
+@instrumented
+def wallet_summary(rows):
+    """Totals over one wallet's transfers, as a Series."""
+    return pd.Series(
+        {
+            "Transfer Volume": rows["amount"].sum(),
+            "Transfer Count": rows["id"].nunique(),
+            "Transfer Fees": rows["fee"].sum(),
+            "Number of Paths": with_path(rows)["path"].nunique(),
+            "First Transfer": rows["created_at"].min(),
+            "Last Transfer": rows["created_at"].max(),
+        }
+    )
+
+
+@instrumented
+def wallet_paths(rows):
+    """One wallet's transfers per path, busiest first."""
+    out = with_path(rows).groupby("path", dropna=False, sort=False).agg(
+        **{
+            "🚀Transfer Count": ("id", "nunique"),
+            "💰Transfer Volume ($USD)": ("amount", "sum"),
+            "💸Transfer Fees ($USD)": ("fee", "sum"),
+            "⏰Last Transfer": ("created_at", "max"),
+        }
+    )
+    out = out.round({"💰Transfer Volume ($USD)": 2, "💸Transfer Fees ($USD)": 4})
+    out = out.sort_values("🚀Transfer Count", ascending=False, kind="stable")
+    return out.rename_axis("🔀Path").reset_index()
+
+
+@instrumented
+def wallet_activity(rows, timeframe):
+    """One wallet's volume and transfer count per `timeframe` bucket and path."""
+    rows = with_path(rows)
+    rows["Date"] = truncate_dates(rows["created_at"], timeframe)
+    return rows.groupby(["Date", "path"], sort=True).agg(
+        **{"Transfer Volume": ("amount", "sum"), "Transfer Count": ("id", "nunique")}
+    ).reset_index().rename(columns={"path": "Path"})
@@ -0,0 +1,100 @@
+import time
+import uuid
+
+import streamlit as st
+
+from data_layer.cancellation import QueryCancelled, raise_if_cancelled, running_query
+from data_layer.config import setting
+from data_layer.connection import connection
+from data_layer.instrumentation import record
+from data_layer.sql import DIALECTS
+from data_layer.transfers import conform, date_params, fetch_frame, service_query, tail_query
+
+# --- Pluggable query backends -----------------------------------------------------------------------------------
+# `snowflake` (default) runs against the warehouse through the connection pool. `duckdb` runs the same transfer
+# queries against a local DuckDB file holding `axelscan.fact_transfers` / `axelscan.fact_gmp` (see
+# `python -m data_layer.fixtures`), so every page works and can be profiled without secrets or network.
+DEFAULT_BACKEND = "snowflake"
+DEFAULT_DUCKDB_PATH = ".cache/axelar.duckdb"
+
+
+class SnowflakeBackend:
+    name = "snowflake"
+    dialect = DIALECTS["snowflake"]
+
+    def fetch_transfers(self, start_date, end_date, service):
+        """Fetch one service's flattened transfer rows between two dates (inclusive)."""
+        query, params = service_query(service, self.dialect), date_params(start_date, end_date)
+        return self._fetch(query, params, f"{service} {start_date}..{end_date}")
+
+    def fetch_tail(self, since, service, limit):
+        """Fetch one service's newest transfers created after `since`, at most `limit` of them."""
+        return self._fetch(tail_query(service, self.dialect, limit), {"since": since}, f"{service} tail")
+
+    def _fetch(self, query, params, label):
+        with connection() as conn:
+            df = fetch_frame(conn, query, params, label=label)
+        # Snowflake upper-cases unquoted identifiers
+        df.columns = [c.lower() for c in df.columns]
+        return conform(df)
+
+
+class DuckDBBackend:
+    name = "duckdb"
+    dialect = DIALECTS["duckdb"]
+
+    def __init__(self, path=DEFAULT_DUCKDB_PATH):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("The duckdb backend needs the `duckdb` package: pip install duckdb") from e
+        self.path = path
+        self._interrupted = duckdb.InterruptException
+        self._conn = duckdb.connect()
+        # Attached as `axelar` so the warehouse's `axelar.axelscan.*` table names resolve unchanged
+        self._conn.execute(f"ATTACH '{path}' AS axelar (READ_ONLY)")
+
+    def fetch_transfers(self, start_date, end_date, service):
+        query, params = service_query(service, self.dialect), date_params(start_date, end_date)
+        return self._fetch(query, params, f"{service} {start_date}..{end_date}")
+
+    def fetch_tail(self, since, service, limit):
+        return self._fetch(tail_query(service, self.dialect, limit), {"since": since}, f"{service} tail")
+
+    def _fetch(self, query, params, label):
+        # A cursor is a thread-safe handle on the same database
+        cursor = self._conn.cursor()
+        query_id = f"duckdb-{uuid.uuid4().hex[:12]}"
+        try:
+            started = time.perf_counter()
+            # Cancelling the caller interrupts the statement, like aborting a warehouse query
+            with running_query(query_id, cursor.interrupt):
+                raise_if_cancelled()
+                try:
+                    cursor.execute(query, params)
+                except self._interrupted as e:
+                    raise QueryCancelled(query_id) from e
+            executed = time.perf_counter()
+            df = cursor.df()
+        finally:
+            cursor.close()
+        record(
+            "query",
+            label,
+            started,
+            query_id=query_id,
+            execute_ms=(executed - started) * 1000,
+            fetch_ms=(time.perf_counter() - executed) * 1000,
+            rows=len(df),
+        )
+        return conform(df)
+
+
+@st.cache_resource
+def get_backend():
+    name = setting("backend", DEFAULT_BACKEND)
+    if name == "snowflake":
+        return SnowflakeBackend()
+    if name == "duckdb":
+        return DuckDBBackend(setting("duckdb_path", DEFAULT_DUCKDB_PATH))
+    raise ValueError(f"Unknown data_layer backend: {name}")
@@ -0,0 +1,345 @@
+import contextlib
+import contextvars
+import datetime as dt
+import functools
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from data_layer.cancellation import POLL_SECONDS, YieldPoint
+from data_layer.config import setting
+from data_layer.instrumentation import frame_stats, record
+from data_layer.scheduler import start_background
+from data_layer.shared_cache import get_shared_cache
+
+# --- Bounded result cache for the loaders -----------------------------------------------------------------------
+# Loader results are kept in one process-wide LRU with a memory budget instead of unbounded `st.cache_data`
+# entries. Each entry carries a TTL: results for closed historical ranges never expire, results for ranges that
+# reach into the store's re-fetch window expire after a short TTL so late-arriving transfers show up.
+#
+# With `shared_cache_path` set, a memory miss checks the shared disk cache next, and a result that is in neither
+# is computed by one process at a time (see `data_layer.shared_cache`).
+#
+# Within a process, concurrent identical calls are coalesced: the first caller computes and the others wait for
+# its result, so a burst of sessions after a deploy or an expiry costs one computation per key.
+#
+# Expired entries are kept for up to `max_stale` seconds more. A call that finds one is answered with it at once
+# while a background thread recomputes it, so a slow or unavailable warehouse delays fresh data, not the page.
+DEFAULT_BUDGET_MB = 1024
+DEFAULT_RECENT_TTL = 300
+DEFAULT_MAX_STALE = 24 * 3600
+
+logger = logging.getLogger(__name__)
+_revalidating = contextvars.ContextVar("axelar_revalidating", default=False)
+
+
+def estimate_bytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    # Arrays, and results such as the transfer index that report their own size
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+def memory_report(df):
+    """Per-column dtype and in-memory size of a frame, largest first."""
+    sizes = df.memory_usage(index=False, deep=True)
+    return pd.DataFrame(
+        {"column": sizes.index, "dtype": [str(df[c].dtype) for c in sizes.index], "bytes": sizes.to_numpy()}
+    ).sort_values("bytes", ascending=False, ignore_index=True)
+
+
+def _shallow_copy(value):
+    # Callers get their own frame object, so adding or replacing columns never touches the cached one
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "expires_at")
+
+    def __init__(self, value, nbytes, expires_at):
+        self.value = value
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 2**20, max_stale=DEFAULT_MAX_STALE):
+        self.budget_bytes = budget_bytes
+        self.max_stale = max_stale
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_held = 0
+        self.hits = self.misses = self.stale_hits = self.evictions = self.expirations = 0
+
+    def _lookup(self, key):
+        """The entry for `key` and whether it is fresh; entries past their stale window are dropped."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at is None:
+            return entry, entry is not None
+        now = time.monotonic()
+        if entry.expires_at + self.max_stale <= now:
+            self._drop(key)
+            self.expirations += 1
+            return None, False
+        return entry, entry.expires_at > now
+
+    def get(self, key):
+        """Return `(True, value)` for a fresh entry, else `(False, None)`."""
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            if not fresh:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def get_stale(self, key):
+        """Return `(True, value)` for an expired entry still within `max_stale`, else `(False, None)`."""
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            if entry is None or fresh:
+                return False, None
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return True, entry.value
+
+    def peek(self, key):
+        """Like `get`, without counting a lookup or touching the entry's recency."""
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            return (True, entry.value) if fresh else (False, None)
+
+    def contains(self, key, stale=False):
+        """Whether `key` has a fresh entry, or with `stale=True` any entry that can still be served."""
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            return fresh or (stale and entry is not None)
+
+    def put(self, key, value, ttl=None):
+        nbytes = estimate_bytes(value)
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.budget_bytes:
+                # Larger than the whole budget: serve it uncached rather than flush everything else
+                return
+            self._entries[key] = _Entry(value, nbytes, expires_at)
+            self.bytes_held += nbytes
+            while self.bytes_held > self.budget_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes_held -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_held = 0
+
+    def report(self):
+        """One row per cached loader result, largest first, with the biggest columns of each frame."""
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+        rows = []
+        for (_, loader, args, kwargs), entry in entries:
+            frame = entry.value if isinstance(entry.value, pd.DataFrame) else None
+            columns = memory_report(frame).head(3) if frame is not None else None
+            rows.append({
+                "loader": loader,
+                "args": ", ".join(map(str, [*args, *(f"{k}={v}" for k, v in kwargs)])),
+                "rows": len(frame) if frame is not None else None,
+                "bytes": entry.nbytes,
+                "largest columns": None if columns is None else ", ".join(
+                    f"{c.column} ({c.dtype}) {c.bytes / 2**20:,.1f} MB" for c in columns.itertuples()
+                ),
+                "expires_in_s": None if entry.expires_at is None else round(entry.expires_at - now),
+            })
+        return pd.DataFrame(rows).sort_values("bytes", ascending=False, ignore_index=True) if rows else pd.DataFrame()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_held": self.bytes_held,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced": _flights.coalesced,
+            }
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.coalesced = 0
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._flights
+
+    def do(self, key, fn):
+        """Run `fn()` once per key at a time; concurrent callers of the same key share its outcome.
+
+        Returns `(value, shared)`, where `shared` tells whether another caller computed the value.
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                else:
+                    self.coalesced += 1
+            if leader:
+                break
+            yield_point = YieldPoint()
+            while not flight.done.wait(POLL_SECONDS):
+                yield_point()
+            if flight.error is None:
+                return flight.value, True
+            if isinstance(flight.error, Exception):
+                raise flight.error
+            # The leader was interrupted (e.g. its script run stopped) rather than failed: take over
+        try:
+            flight.value = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value, False
+
+
+_flights = SingleFlight()
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(
+        budget_bytes=setting("cache_budget_mb", DEFAULT_BUDGET_MB) * 2**20,
+        max_stale=setting("max_stale", DEFAULT_MAX_STALE),
+    )
+
+
+@contextlib.contextmanager
+def revalidating():
+    """Within the block, cached loaders recompute expired entries instead of serving them stale."""
+    token = _revalidating.set(True)
+    try:
+        yield
+    finally:
+        _revalidating.reset(token)
+
+
+def range_ttl(start_date, end_date, *args, today=None):
+    """Short TTL while the range reaches the last few days, no expiry once it is closed."""
+    # The store's re-fetch window decides which days may still change
+    from data_layer.store import DEFAULT_REFETCH_DAYS
+
+    today = today or dt.date.today()
+    open_from = today - dt.timedelta(days=setting("refetch_days", DEFAULT_REFETCH_DAYS))
+    if pd.Timestamp(end_date).date() >= open_from:
+        return setting("recent_ttl", DEFAULT_RECENT_TTL)
+    return None
+
+
+def cached_loader(fn=None, *, ttl=range_ttl):
+    """Serve a loader from the bounded result cache, recording each call as a hit, shared, stale, coalesced or miss.
+
+    `ttl` is a number of seconds, None for no expiry, or a callable deciding it from the loader's arguments.
+    `loader.is_cached(*args)` tells whether a call would be served from the cache, a stale entry included.
+    """
+    if fn is None:
+        return functools.partial(cached_loader, ttl=ttl)
+    name = fn.__name__
+
+    def key_of(args, kwargs):
+        return (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache = get_result_cache()
+        key = key_of(args, kwargs)
+        started = time.perf_counter()
+        hit, value = cache.get(key)
+        status = "hit"
+        if not hit and not _revalidating.get():
+            hit, value = cache.get_stale(key)
+            if hit:
+                status = "stale"
+                if not _flights.in_flight(key):
+                    start_background(f"revalidate {name}", revalidate, cache, key, args, kwargs)
+        if not hit:
+            (value, status), coalesced = _flights.do(key, lambda: load(cache, key, args, kwargs))
+            if coalesced:
+                status = "coalesced"
+        record("loader", name, started, cache=status, **frame_stats(value))
+        return _shallow_copy(value)
+
+    def load(cache, key, args, kwargs):
+        # A flight for this key may have finished between the caller's lookup and this one starting
+        found, value = cache.peek(key)
+        if found:
+            return value, "hit"
+        seconds = ttl(*args, **kwargs) if callable(ttl) else ttl
+        shared = get_shared_cache()
+        if shared is None:
+            value, status = fn(*args, **kwargs), "miss"
+        else:
+            with shared.lock(key):
+                found, value, seconds_left = shared.get(key)
+                if found:
+                    status, seconds = "shared", seconds_left
+                else:
+                    value, status = fn(*args, **kwargs), "miss"
+                    shared.put(key, value, seconds)
+        cache.put(key, value, seconds)
+        return value, status
+
+    def revalidate(cache, key, args, kwargs):
+        try:
+            with revalidating():
+                _flights.do(key, lambda: load(cache, key, args, kwargs))
+        except Exception:
+            # The stale entry stays in place and the next call past it tries again
+            logger.warning("Revalidating %s%r failed", name, args, exc_info=True)
+
+    def is_cached(*args, **kwargs):
+        key = key_of(args, kwargs)
+        shared = get_shared_cache()
+        return get_result_cache().contains(key, stale=True) or (shared is not None and shared.contains(key))
+
+    wrapper.is_cached = is_cached
+    return wrapper
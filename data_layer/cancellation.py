@@ -0,0 +1,98 @@
+import contextlib
+import contextvars
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- Cancelling warehouse work a rerun or a closed session no longer needs --------------------------------------
+# While loaders wait for their queries, the script thread keeps yielding to Streamlit (by touching an empty
+# placeholder), which is where Streamlit raises its rerun / stop exceptions. `cancel_scope` turns that into a
+# cancellation event the query threads poll, and every in-flight query is also registered under its scope so the
+# scope can abort them at once instead of letting superseded work run on the warehouse. A session that ends has
+# its script run stopped by Streamlit, so its queries are aborted the same way.
+POLL_SECONDS = 0.25
+SCRIPT_THREAD_NAME = "ScriptRunner.scriptThread"
+
+_cancel_event = contextvars.ContextVar("axelar_cancel_event", default=None)
+_running_lock = threading.Lock()
+_running = {}
+
+
+class QueryCancelled(Exception):
+    """Raised in a query thread when the script run that asked for the query is gone."""
+
+
+def cancelled():
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def wait_cancelled(timeout):
+    """Sleep up to `timeout` seconds, waking early on cancellation; returns whether the scope was cancelled."""
+    event = _cancel_event.get()
+    if event is None:
+        time.sleep(timeout)
+        return False
+    return event.wait(timeout)
+
+
+def raise_if_cancelled():
+    if cancelled():
+        raise QueryCancelled()
+
+
+@contextlib.contextmanager
+def running_query(query_id, abort):
+    """Register an in-flight query under the current cancel scope; `abort()` cancels it on the warehouse."""
+    with _running_lock:
+        _running[query_id] = (abort, _cancel_event.get())
+    try:
+        yield
+    finally:
+        with _running_lock:
+            _running.pop(query_id, None)
+
+
+def _abort_scope(event):
+    with _running_lock:
+        aborts = [abort for abort, owner in _running.values() if owner is event]
+    for abort in aborts:
+        with contextlib.suppress(Exception):
+            abort()
+
+
+@contextlib.contextmanager
+def cancel_scope():
+    """Run a block whose queries are cancelled if it exits with an exception (a rerun or stop included).
+
+    Context variables set here are what task threads copy, so enter the scope before submitting them.
+    """
+    event = threading.Event()
+    token = _cancel_event.set(event)
+    try:
+        yield event
+    except BaseException:
+        event.set()
+        _abort_scope(event)
+        raise
+    finally:
+        _cancel_event.reset(token)
+
+
+class YieldPoint:
+    """Lets Streamlit interrupt a blocked script thread between waits; a no-op on any other thread."""
+
+    def __init__(self):
+        self._enabled = (
+            threading.current_thread().name == SCRIPT_THREAD_NAME and get_script_run_ctx(suppress_warning=True)
+        )
+        self._placeholder = None
+
+    def __call__(self):
+        if not self._enabled:
+            return
+        if self._placeholder is None:
+            self._placeholder = st.empty()
+        self._placeholder.empty()
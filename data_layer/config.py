@@ -0,0 +1,21 @@
+import os
+
+import streamlit as st
+
+# --- Data layer settings ----------------------------------------------------------------------------------------
+# Read from `AXELAR_<NAME>` environment variables first, then the optional `[data_layer]` section of
+# `.streamlit/secrets.toml`, then the default. Values are coerced to the default's type.
+
+
+def setting(name, default):
+    value = os.environ.get(f"AXELAR_{name.upper()}")
+    if value is None:
+        try:
+            value = st.secrets.get("data_layer", {}).get(name)
+        except FileNotFoundError:
+            value = None
+    if value is None:
+        return default
+    if isinstance(default, bool) and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return type(default)(value) if default is not None else value
@@ -0,0 +1,74 @@
+import logging
+
+import pandas as pd
+
+from data_layer.cache import cached_loader
+from data_layer.scheduler import start_background
+from data_layer.store import concat_blocks, day_range, fetch_from_warehouse, get_store
+
+# --- Keyset-paginated transfer explorer -------------------------------------------------------------------------
+# Pages through a range's transfers newest first, ordered by (created_at, id). A page is addressed by the key of
+# the row just before it instead of an offset, so turning a page reads only the day partitions it spans, one at a
+# time, and stays consistent while recent days are re-fetched. Only the partitions a page walks through are brought
+# up to date, `REFRESH_DAYS` at a time, without loading the range's row blocks. Pages are cached like any loader
+# result, and the page after the visible one is prefetched in the background so turning to it is a cache hit.
+DEFAULT_PAGE_SIZE = 100
+REFRESH_DAYS = 7
+SORT_KEY = ["created_at", "id"]
+
+logger = logging.getLogger(__name__)
+
+
+def follows(rows, key):
+    """Rows that come after `key = (created_at, id)` in newest-first order."""
+    created_at, transfer_id = key
+    return (rows["created_at"] < created_at) | ((rows["created_at"] == created_at) & (rows["id"] < transfer_id))
+
+
+@cached_loader
+def load_transfer_page(start_date, end_date, service=None, after=None, page_size=DEFAULT_PAGE_SIZE):
+    """Up to `page_size` transfers of the range, newest first, starting after the row keyed `after`.
+
+    Returns `(rows, next_key)`, where `next_key` addresses the following page and is None on the last one.
+    """
+    store = get_store()
+    days = day_range(start_date, end_date)
+    if after is not None:
+        days = [day for day in days if day <= after[0].date()]
+    days.reverse()
+    # One row more than a page tells whether another page follows
+    parts, wanted = [], page_size + 1
+    for i, day in enumerate(days):
+        if i % REFRESH_DAYS == 0:
+            store.refresh(days[i:i + REFRESH_DAYS], fetch_from_warehouse)
+        if not store.is_cached(day):
+            continue
+        part = pd.read_parquet(store.partition_path(day))
+        if service is not None:
+            part = part[part["service"] == service]
+        if after is not None:
+            part = part[follows(part, after)]
+        part = part.sort_values(SORT_KEY, ascending=False).head(wanted)
+        parts.append(part)
+        wanted -= len(part)
+        if not wanted:
+            break
+    rows = concat_blocks(parts)
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows.head(page_size)
+    last = rows.iloc[-1]
+    return rows, (last["created_at"], last["id"])
+
+
+def _prefetch(args):
+    try:
+        load_transfer_page(*args)
+    except Exception:
+        logger.warning("Prefetching transfer page %r failed", args, exc_info=True)
+
+
+def prefetch_page(*args):
+    """Load `load_transfer_page(*args)` into the cache on a background thread, unless it is cached already."""
+    if not load_transfer_page.is_cached(*args):
+        start_background("prefetch transfer page", _prefetch, args)
@@ -0,0 +1,208 @@
+"""Build the offline DuckDB stand-in for `axelar.axelscan.fact_transfers` / `fact_gmp`.
+
+    python -m data_layer.fixtures generate --rows 2000000
+    python -m data_layer.fixtures record --start-date 2025-07-01 --end-date 2025-07-31
+
+`generate` synthesizes rows with the same nested `data` JSON paths the transfer queries read; `record` copies real
+Filecoin rows from Snowflake. Point the app at the file with `AXELAR_BACKEND=duckdb`.
+
+`synthetic_transfers` builds already-flattened rows in memory for stubs and benchmarks.
+"""
+import argparse
+import datetime as dt
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_layer.backends import DEFAULT_DUCKDB_PATH
+from data_layer.sql import DIALECTS, Select, col, compile_query, raw, varchar
+from data_layer.transfers import (
+    GMP_TOUCHES_FILECOIN,
+    IN_DATE_RANGE,
+    SERVICES,
+    TRANSFER_TOUCHES_FILECOIN,
+    conform,
+    date_params,
+)
+
+CHAINS = ["ethereum", "Polygon", "arbitrum", "base", "Avalanche", "binance", "optimism", "moonbeam", "linea"]
+ASSETS = ["FIL", "USDC", "WETH", "axlUSDC", "USDT"]
+ASSET_PRICES = [4.5, 1.0, 3000.0, 1.0, 1.0]
+
+# Shared random draws per synthetic row; heavy-tailed users and lognormal USD amounts
+_BASE_ROWS = """
+    SELECT i,
+           TIMESTAMP '{start}' + to_seconds(CAST(floor(random() * {span_seconds}) AS BIGINT)) AS created_at,
+           random() < {filecoin_share} AS touches_filecoin,
+           random() < 0.5 AS outbound,
+           list_element({chains}, CAST(floor(random() * {n_chains}) AS INTEGER) + 1) AS other_chain,
+           list_element({chains}, CAST(floor(random() * {n_chains}) AS INTEGER) + 1) AS third_chain,
+           CAST(floor(random() * {n_assets}) AS INTEGER) + 1 AS asset_no,
+           '0x' || lpad(printf('%x', CAST(floor(pow(random(), 3) * {users}) AS BIGINT)), 40, '0') AS address,
+           exp(5 + 2.5 * sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random())) AS usd,
+           random() < 0.1 AS unpriced,
+           random() AS status_draw
+    FROM range({rows}) AS t(i)
+"""
+
+_SOURCE_CHAIN = "CASE WHEN NOT touches_filecoin THEN other_chain WHEN outbound THEN 'filecoin' ELSE other_chain END"
+_DESTINATION_CHAIN = "CASE WHEN NOT touches_filecoin THEN third_chain WHEN outbound THEN other_chain ELSE 'filecoin' END"
+
+GENERATE_TRANSFERS = f"""
+    CREATE OR REPLACE TABLE axelar.axelscan.fact_transfers AS
+    WITH base AS ({_BASE_ROWS})
+    SELECT created_at,
+           'transfer-' || i AS id,
+           CASE WHEN status_draw < 0.97 THEN 'executed' ELSE 'failed' END AS status,
+           CASE WHEN status_draw < 0.97 THEN 'received' ELSE 'failed' END AS simplified_status,
+           address AS sender_address,
+           json_object(
+               'send', json_object(
+                   'original_source_chain', {_SOURCE_CHAIN},
+                   'original_destination_chain', {_DESTINATION_CHAIN},
+                   'amount', usd / list_element({{prices}}, asset_no),
+                   'fee_value', 0.05 + random() * 2
+               ),
+               'link', json_object(
+                   'price', CASE WHEN unpriced THEN NULL ELSE list_element({{prices}}, asset_no) END,
+                   'asset', list_element({{assets}}, asset_no)
+               )
+           ) AS data
+    FROM base
+"""
+
+GENERATE_GMP = f"""
+    CREATE OR REPLACE TABLE axelar.axelscan.fact_gmp AS
+    WITH base AS ({_BASE_ROWS})
+    SELECT created_at,
+           'gmp-' || i AS id,
+           CASE WHEN status_draw < 0.95 THEN 'executed' ELSE 'error' END AS status,
+           CASE WHEN status_draw < 0.95 THEN 'received' ELSE 'failed' END AS simplified_status,
+           json_object(
+               'call', json_object(
+                   'chain', {_SOURCE_CHAIN},
+                   'returnValues', json_object('destinationChain', {_DESTINATION_CHAIN}),
+                   'transaction', json_object('from', address)
+               ),
+               'value', CASE WHEN unpriced THEN NULL ELSE usd END,
+               'gas', CASE WHEN random() < 0.2 THEN NULL ELSE json_object('gas_used_amount', random() * 0.0005) END,
+               'gas_price_rate', json_object(
+                   'source_token', json_object('token_price', json_object('usd', list_element({{prices}}, asset_no)))
+               ),
+               'fees', json_object('express_fee_usd', random() * 3),
+               'approved', json_object('returnValues', json_object('symbol', list_element({{assets}}, asset_no)))
+           ) AS data
+    FROM base
+"""
+
+# Raw Filecoin rows pulled from Snowflake by `record`; `data` is serialized to JSON text
+RAW_COLUMNS = {
+    "created_at": col("created_at"),
+    "id": varchar(col("id")),
+    "status": col("status"),
+    "simplified_status": col("simplified_status"),
+}
+RECORD_SPECS = {
+    "fact_transfers": Select(
+        "axelar.axelscan.fact_transfers",
+        columns={**RAW_COLUMNS, "sender_address": col("sender_address"), "data": raw("TO_JSON(data)")},
+        where=(TRANSFER_TOUCHES_FILECOIN, IN_DATE_RANGE),
+    ),
+    "fact_gmp": Select(
+        "axelar.axelscan.fact_gmp",
+        columns={**RAW_COLUMNS, "data": raw("TO_JSON(data)")},
+        where=(GMP_TOUCHES_FILECOIN, IN_DATE_RANGE),
+    ),
+}
+
+
+def synthetic_transfers(rows, start_date, end_date, users=50000, seed=0):
+    """`rows` flattened Filecoin transfers per service, shaped like the transfer queries' output."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start_date)
+    span_seconds = int((pd.Timestamp(end_date) - start).total_seconds()) + 86400
+    frames = []
+    for service in SERVICES:
+        outbound = rng.random(rows) < 0.5
+        other = np.array([c.lower() for c in CHAINS], dtype=object)[rng.integers(0, len(CHAINS), rows)]
+        asset_no = rng.integers(0, len(ASSETS), rows)
+        amount = np.exp(5 + 2.5 * rng.standard_normal(rows))
+        amount[rng.random(rows) < 0.1] = np.nan
+        user_no = np.floor(rng.random(rows) ** 3 * users).astype(np.int64)
+        frames.append(pd.DataFrame({
+            "created_at": start + pd.to_timedelta(rng.integers(0, span_seconds, rows), unit="s"),
+            "source_chain": np.where(outbound, "filecoin", other),
+            "destination_chain": np.where(outbound, other, "filecoin"),
+            "user": pd.Series(user_no).map("0x{:040x}".format).to_numpy(dtype=object),
+            "amount": amount,
+            "fee": 0.05 + rng.random(rows) * 2,
+            "id": [f"{service[:3].lower()}-{i}" for i in range(rows)],
+            "service": service,
+            "asset": np.array(ASSETS, dtype=object)[asset_no],
+        }))
+    return conform(pd.concat(frames, ignore_index=True))
+
+
+def _open(path):
+    import duckdb
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect()
+    conn.execute(f"ATTACH '{path}' AS axelar")
+    conn.execute("CREATE SCHEMA IF NOT EXISTS axelar.axelscan")
+    return conn
+
+
+def generate(path, rows, start_date, end_date, users=50000, filecoin_share=0.7, seed=0.42):
+    """Write `rows` synthetic rows into each of the two fact tables."""
+    start = dt.datetime.combine(start_date, dt.time())
+    span_seconds = int((dt.datetime.combine(end_date, dt.time()) - start).total_seconds()) + 86400
+    params = dict(
+        start=start, span_seconds=span_seconds, rows=rows, users=users, filecoin_share=filecoin_share,
+        chains=CHAINS, n_chains=len(CHAINS), assets=ASSETS, prices=ASSET_PRICES, n_assets=len(ASSETS),
+    )
+    conn = _open(path)
+    conn.execute("SELECT setseed(?)", [seed])
+    for template in (GENERATE_TRANSFERS, GENERATE_GMP):
+        conn.execute(template.format(**params))
+    conn.close()
+
+
+def record(path, start_date, end_date):
+    """Copy the raw Filecoin rows of both fact tables for a date range from Snowflake."""
+    from data_layer.connection import connection
+    from data_layer.transfers import fetch_frame
+
+    conn = _open(path)
+    for table, spec in RECORD_SPECS.items():
+        with connection() as sf:
+            query = compile_query(spec, DIALECTS["snowflake"])
+            frame = fetch_frame(sf, query, date_params(start_date, end_date), label=f"record {table}")
+        frame.columns = [c.lower() for c in frame.columns]
+        conn.register("recorded", frame)
+        columns = ", ".join(c for c in frame.columns if c != "data")
+        conn.execute(
+            f"CREATE OR REPLACE TABLE axelar.axelscan.{table} AS SELECT {columns}, CAST(data AS JSON) AS data FROM recorded"
+        )
+        conn.unregister("recorded")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["generate", "record"])
+    parser.add_argument("--path", default=DEFAULT_DUCKDB_PATH)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per fact table (generate)")
+    parser.add_argument("--users", type=int, default=50_000, help="distinct sender addresses (generate)")
+    parser.add_argument("--start-date", type=dt.date.fromisoformat, default=dt.date(2024, 1, 1))
+    parser.add_argument("--end-date", type=dt.date.fromisoformat, default=dt.date(2025, 7, 31))
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate(args.path, args.rows, args.start_date, args.end_date, users=args.users)
+    else:
+        record(args.path, args.start_date, args.end_date)
+
+
+if __name__ == "__main__":
+    main()
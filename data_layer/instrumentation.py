@@ -0,0 +1,189 @@
+import contextvars
+import functools
+import threading
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# --- Per-rerun instrumentation of loaders, warehouse queries and local aggregations --------------------------
+# Each page starts a trace at the top of its script run. Cached loaders record their wall time and whether the
+# result cache served them, backends record one event per warehouse query (query id, execute / fetch / decode time,
+# rows, bytes) and page aggregations record their compute time. The trace is carried in a context variable, so
+# queries running on scheduler threads land in the rerun that asked for them.
+#
+# Opening any page with `?perf=1` adds a sidebar panel with the rerun's timeline.
+PERF_QUERY_PARAM = "perf"
+EVENT_COLUMNS = [
+    "kind",
+    "name",
+    "start_ms",
+    "duration_ms",
+    "cache",
+    "rows",
+    "bytes",
+    "query_id",
+    "execute_ms",
+    "fetch_ms",
+    "decode_ms",
+    "thread",
+]
+KIND_COLORS = {"loader": "#0090ff", "query": "#ff7f0e", "compute": "#2ca02c"}
+
+_trace = contextvars.ContextVar("axelar_perf_trace", default=None)
+
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+
+    def add(self, kind, name, started, **fields):
+        event = {
+            "kind": kind,
+            "name": name,
+            "start_ms": (started - self.started) * 1000,
+            "duration_ms": (time.perf_counter() - started) * 1000,
+            "thread": threading.current_thread().name,
+            **fields,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def to_frame(self):
+        with self._lock:
+            events = list(self.events)
+        df = pd.DataFrame(events, columns=EVENT_COLUMNS)
+        return df.sort_values("start_ms", kind="stable").reset_index(drop=True)
+
+
+def start_trace():
+    """Start a fresh trace for the current script run and return it."""
+    trace = Trace()
+    _trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _trace.get()
+
+
+def record(kind, name, started, **fields):
+    """Record an event that began at `perf_counter()` value `started` and ends now, if a trace is active."""
+    trace = current_trace()
+    if trace is not None:
+        trace.add(kind, name, started, **fields)
+
+
+def frame_stats(df):
+    """Rows and shallow in-memory bytes of a DataFrame result, or blanks for anything else."""
+    if isinstance(df, pd.DataFrame):
+        return {"rows": len(df), "bytes": int(df.memory_usage(index=False).sum())}
+    return {}
+
+
+def instrumented(fn=None, *, kind="compute", name=None):
+    """Record every call of `fn` in the active trace."""
+    if fn is None:
+        return functools.partial(instrumented, kind=kind, name=name)
+    label = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if current_trace() is None:
+            return fn(*args, **kwargs)
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        record(kind, label, started, **frame_stats(result))
+        return result
+
+    return wrapper
+
+
+# --- Developer performance panel -------------------------------------------------------------------------------
+def perf_enabled():
+    return st.query_params.get(PERF_QUERY_PARAM, "") not in ("", "0", "false")
+
+
+def render_cache_stats():
+    # Imported here: the cache module records its loader events through this one
+    from data_layer.cache import get_result_cache
+    from data_layer.resilience import get_breaker
+    from data_layer.shared_cache import get_shared_cache
+    from data_layer.warmer import get_warmer
+
+    cache = get_result_cache()
+    stats = cache.stats()
+    ratio = "n/a" if stats["hit_ratio"] is None else f"{stats['hit_ratio']:.0%}"
+    st.caption(
+        f"Result cache: {stats['entries']} entries, {stats['bytes_held'] / 2**20:,.1f} of "
+        f"{stats['budget_bytes'] / 2**20:,.0f} MB, hit ratio {ratio}, "
+        f"{stats['stale_hits']} served stale, {stats['evictions']} evicted, {stats['expirations']} expired, "
+        f"{stats['coalesced']} coalesced"
+    )
+    shared = get_shared_cache()
+    if shared is not None:
+        stats = shared.stats()
+        st.caption(
+            f"Shared disk cache: {stats['keys']} keys, {stats['blobs']} blobs, "
+            f"{stats['bytes_on_disk'] / 2**20:,.1f} MB"
+        )
+    report = cache.report()
+    if not report.empty:
+        with st.popover("Cached results by size"):
+            st.dataframe(report, use_container_width=True, hide_index=True)
+    st.caption(f"Warehouse circuit: {get_breaker().state}")
+    last_pass = get_warmer().last_pass
+    if last_pass is not None:
+        st.caption(
+            f"Cache warmer: {last_pass['ranges']} ranges in {last_pass['seconds']:,.1f}s, "
+            f"{time.time() - last_pass['finished']:,.0f}s ago"
+        )
+
+
+def render_perf_panel(trace=None):
+    """Show the rerun's trace in the sidebar when the page was opened with `?perf=1`."""
+    trace = trace or current_trace()
+    if trace is None or not perf_enabled():
+        return
+    events = trace.to_frame()
+    total_ms = (time.perf_counter() - trace.started) * 1000
+    with st.sidebar.expander("⏱ Performance", expanded=True):
+        st.caption(f"Rerun took {total_ms:,.0f} ms, {len(events)} events")
+        if events.empty:
+            return
+        queries = events[events["kind"] == "query"]
+        # Loaders composed from cached blocks have no cache status of their own
+        lookups = events["cache"].dropna()
+        col1, col2 = st.columns(2)
+        col1.metric("Warehouse queries", len(queries))
+        col2.metric("Cache hits", f"{(lookups != 'miss').sum()}/{len(lookups)}")
+        render_cache_stats()
+
+        fig = go.Figure()
+        for kind, group in events.groupby("kind", sort=False):
+            fig.add_bar(
+                y=group["name"],
+                x=group["duration_ms"],
+                base=group["start_ms"],
+                orientation="h",
+                name=kind,
+                marker_color=KIND_COLORS.get(kind),
+                customdata=group[["cache", "rows", "query_id"]].astype(str),
+                hovertemplate=(
+                    "%{y}<br>%{base:,.0f} ms + %{x:,.0f} ms<br>"
+                    "cache %{customdata[0]}, rows %{customdata[1]}<br>%{customdata[2]}<extra></extra>"
+                ),
+            )
+        fig.update_layout(
+            height=120 + 22 * len(events),
+            barmode="overlay",
+            xaxis_title="ms since rerun start",
+            yaxis={"autorange": "reversed", "type": "category"},
+            margin={"l": 0, "r": 0, "t": 10, "b": 0},
+            legend={"orientation": "h"},
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(events.round(1), use_container_width=True, hide_index=True)
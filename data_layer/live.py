@@ -0,0 +1,111 @@
+import datetime as dt
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+from data_layer.backends import get_backend
+from data_layer.config import setting
+from data_layer.resilience import WarehouseUnavailable, resilient_call
+from data_layer.scheduler import run_parallel
+from data_layer.store import concat_blocks
+from data_layer.transfers import SERVICES, TRANSFER_COLUMNS, conform
+
+# --- Live tail of new transfers ---------------------------------------------------------------------------------
+# The Monitoring page's live mode shows the newest transfers from a bounded in-memory ring buffer shared by every
+# session. Polling asks the warehouse only for rows created after the newest one seen (the watermark), at most
+# once per `tail_interval` seconds however many sessions are watching.
+#
+# Transfers are listed once executed, which can be a while after `created_at`, so each poll re-reads
+# `tail_lookback` seconds behind the watermark; rows already in the buffer are skipped by id.
+DEFAULT_TAIL_SIZE = 500
+DEFAULT_TAIL_INTERVAL = 10
+DEFAULT_TAIL_LOOKBACK = 900
+# How far back the first poll of a fresh buffer looks
+DEFAULT_TAIL_SEED_HOURS = 24
+
+
+def _utc_now():
+    # `created_at` is stored as naive UTC
+    return pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+
+class LiveTail:
+    def __init__(self, size=DEFAULT_TAIL_SIZE, interval=DEFAULT_TAIL_INTERVAL, lookback=DEFAULT_TAIL_LOOKBACK,
+                 seed_hours=DEFAULT_TAIL_SEED_HOURS):
+        self.size = size
+        self.interval = interval
+        self.lookback = dt.timedelta(seconds=lookback)
+        self.seed = dt.timedelta(hours=seed_hours)
+        self.rows = deque(maxlen=size)
+        self.watermark = None
+        self.polled_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _fetch(self, since, service):
+        return resilient_call(get_backend().fetch_tail, since, service, self.size)
+
+    def poll(self):
+        """Add transfers created since the last poll and return how many the buffer kept; a no-op within `interval`
+        of it."""
+        # Sessions arriving while another one polls show what is buffered and pick up its rows on their next run
+        if not self._poll_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.monotonic()
+            if self.polled_at is not None and now - self.polled_at < self.interval:
+                return 0
+            # Set before querying, so a failing warehouse is not asked again until the next interval either
+            self.polled_at = now
+            since = _utc_now() - self.seed if self.watermark is None else self.watermark - self.lookback
+            tasks = {service: (self._fetch, since.to_pydatetime(), service) for service in SERVICES}
+            try:
+                results, _ = run_parallel(tasks)
+            except WarehouseUnavailable as e:
+                self.last_error = e
+                return 0
+            self.last_error = None
+            with self._lock:
+                return self._append(concat_blocks(list(results.values())))
+        finally:
+            self._poll_lock.release()
+
+    def _append(self, new):
+        seen = {row["id"] for row in self.rows}
+        new = new[~new["id"].isin(seen)]
+        if new.empty:
+            return 0
+        # The buffer keeps the newest `size` transfers, so lookback rows older than all of them are dropped at once
+        rows = sorted([*self.rows, *new.to_dict("records")], key=lambda row: (row["created_at"], row["id"]))
+        self.rows = deque(rows, maxlen=self.size)
+        latest = new["created_at"].max()
+        self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+        return len({row["id"] for row in self.rows} - seen)
+
+    def to_frame(self):
+        """The buffered transfers, newest first."""
+        with self._lock:
+            rows = list(self.rows)
+        df = conform(pd.DataFrame(rows, columns=TRANSFER_COLUMNS))
+        return df.sort_values(["created_at", "id"], ascending=False).reset_index(drop=True)
+
+
+def poll_interval():
+    return setting("tail_interval", DEFAULT_TAIL_INTERVAL)
+
+
+@st.cache_resource
+def get_live_tail():
+    return LiveTail(
+        size=setting("tail_size", DEFAULT_TAIL_SIZE),
+        interval=poll_interval(),
+        lookback=setting("tail_lookback", DEFAULT_TAIL_LOOKBACK),
+        seed_hours=setting("tail_seed_hours", DEFAULT_TAIL_SEED_HOURS),
+    )
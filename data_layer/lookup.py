@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from data_layer.addresses import normalize_addresses
+from data_layer.cache import cached_loader
+from data_layer.instrumentation import instrumented
+from data_layer.store import load_axelar_services
+
+# --- Wallet and transfer id lookups over the cached rows --------------------------------------------------------
+# A range's cached transfer rows are sorted once by sender (newest first within each), with the offset where each
+# sender's rows start, so a wallet's full history is a hashed lookup of its address plus a slice. Transfer ids go
+# through a hashed index over the same rows. Lookups never query the warehouse.
+#
+# Senders are keyed by the rows' own address categories rather than by address index ids, so an index shared
+# through the disk cache stays valid in processes that keep a different store.
+
+
+class TransferIndex:
+    def __init__(self, df):
+        rows = df.sort_values(["user", "created_at", "id"], ascending=[True, False, False], na_position="first")
+        self.rows = rows.reset_index(drop=True)
+        user = self.rows["user"].astype("category")
+        self.addresses = user.cat.categories
+        # Rows without a sender (code -1) sort first; sender i's rows are rows[starts[i]:starts[i + 1]]
+        self.starts = np.searchsorted(user.cat.codes.to_numpy(), np.arange(len(self.addresses) + 1))
+        self.ids = pd.Index(self.rows["id"])
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def nbytes(self):
+        # The id index shares the rows' id array
+        return int(self.rows.memory_usage(index=True, deep=True).sum() + self.starts.nbytes)
+
+    def wallet(self, address):
+        """Every transfer sent by `address`, newest first; empty if it sent none in the range."""
+        position = self.addresses.get_indexer(normalize_addresses([address]))[0]
+        if position < 0:
+            return self.rows.iloc[:0]
+        return self.rows.iloc[self.starts[position]:self.starts[position + 1]]
+
+    def transfer(self, transfer_id):
+        """The transfer with id `transfer_id` as a frame of at most one row; ids are unique across services."""
+        position = self.ids.get_indexer([str(transfer_id).strip()])[0]
+        if position < 0:
+            return self.rows.iloc[:0]
+        return self.rows.iloc[position:position + 1]
+
+    def find(self, query):
+        """Rows of the wallet `query`, else of the transfer with that id, as `(kind, rows)`; kind is None if neither
+        is in the range."""
+        rows = self.wallet(query)
+        if not rows.empty:
+            return "wallet", rows
+        rows = self.transfer(query)
+        if not rows.empty:
+            return "transfer", rows
+        return None, rows
+
+
+@cached_loader
+def load_transfer_index(start_date, end_date):
+    return build_transfer_index(load_axelar_services(start_date, end_date))
+
+
+@instrumented
+def build_transfer_index(df):
+    return TransferIndex(df)
@@ -0,0 +1,144 @@
+import functools
+import logging
+import random
+import threading
+import time
+
+import snowflake.connector.errors as sf_errors
+import streamlit as st
+
+from data_layer.cancellation import QueryCancelled, wait_cancelled
+from data_layer.config import setting
+
+# --- Riding out warehouse hiccups -------------------------------------------------------------------------------
+# Transient failures (dropped connections, 5xx from Snowflake, timeouts) are retried with full-jitter exponential
+# backoff. Calls that still fail count against a process-wide circuit breaker: after `breaker_failures` failures
+# in a row it opens and warehouse calls fail fast with `CircuitOpen` for `breaker_reset` seconds, then a single
+# trial call decides whether it closes again. Callers fall back to cached data while the warehouse is unavailable,
+# and pages show `unavailable_message` for ranges that are not cached.
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 8.0
+DEFAULT_BREAKER_FAILURES = 5
+DEFAULT_BREAKER_RESET = 30.0
+
+TRANSIENT_ERRORS = (
+    sf_errors.OperationalError,
+    sf_errors.InterfaceError,
+    sf_errors.ServiceUnavailableError,
+    sf_errors.GatewayTimeoutError,
+    sf_errors.BadGatewayError,
+    sf_errors.OtherHTTPRetryableError,
+    sf_errors.RequestTimeoutError,
+    sf_errors.InternalServerError,
+    TimeoutError,
+    ConnectionError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WarehouseUnavailable(Exception):
+    """The warehouse kept failing transiently, or the circuit breaker is open."""
+
+
+class CircuitOpen(WarehouseUnavailable):
+    pass
+
+
+def unavailable_message(error):
+    """What a page shows instead of its data when the warehouse is unavailable and the range is not cached."""
+    return (
+        f"⚠️The data warehouse is unavailable and the selected period is not fully cached yet ({error}). "
+        "Periods viewed before, such as the default one, are still available; please try this one again shortly."
+    )
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Full jitter: a uniform delay up to the exponential backoff for this attempt (0-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+def call_with_retry(fn, *args, attempts=DEFAULT_RETRY_ATTEMPTS, base_delay=DEFAULT_RETRY_BASE_DELAY,
+                    max_delay=DEFAULT_RETRY_MAX_DELAY):
+    """Call `fn(*args)`, retrying transient errors; raises WarehouseUnavailable once attempts run out."""
+    for attempt in range(attempts):
+        try:
+            return fn(*args)
+        except TRANSIENT_ERRORS as e:
+            if attempt == attempts - 1:
+                raise WarehouseUnavailable(f"Warehouse call failed {attempts} times: {e}") from e
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning("Transient warehouse error (%s), retrying in %.1fs", e, delay)
+            if wait_cancelled(delay):
+                raise QueryCancelled() from e
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=DEFAULT_BREAKER_FAILURES, reset_after=DEFAULT_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def _admit(self):
+        """Whether this call is the half-open trial; raises CircuitOpen if it may not run at all."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            wait = self.reset_after - (time.monotonic() - self.opened_at)
+            if wait > 0 or self._trial_running:
+                raise CircuitOpen(f"Warehouse circuit open, next attempt in {max(wait, 0):.0f}s")
+            self._trial_running = True
+            return True
+
+    def call(self, fn, *args):
+        # Other errors (bad SQL, cancellation) are not an outage: they neither trip nor close the circuit
+        trial = self._admit()
+        try:
+            result = fn(*args)
+        except WarehouseUnavailable:
+            with self._lock:
+                self.failures += 1
+                if trial or self.failures >= self.failure_threshold:
+                    if self.opened_at is None:
+                        logger.error("Opening the warehouse circuit after %d failures", self.failures)
+                    self.opened_at = time.monotonic()
+            raise
+        else:
+            with self._lock:
+                self.failures = 0
+                self.opened_at = None
+            return result
+        finally:
+            if trial:
+                with self._lock:
+                    self._trial_running = False
+
+
+@st.cache_resource
+def get_breaker():
+    return CircuitBreaker(
+        failure_threshold=setting("breaker_failures", DEFAULT_BREAKER_FAILURES),
+        reset_after=setting("breaker_reset", DEFAULT_BREAKER_RESET),
+    )
+
+
+def resilient_call(fn, *args):
+    """Call the warehouse through the circuit breaker, with retries inside it."""
+    retrying = functools.partial(
+        call_with_retry,
+        attempts=setting("retry_attempts", DEFAULT_RETRY_ATTEMPTS),
+        base_delay=setting("retry_base_delay", DEFAULT_RETRY_BASE_DELAY),
+        max_delay=setting("retry_max_delay", DEFAULT_RETRY_MAX_DELAY),
+    )
+    return get_breaker().call(retrying, fn, *args)
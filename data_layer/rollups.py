@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from data_layer.aggregations import direction_of, truncate_dates, with_path
+from data_layer.cache import cached_loader
+from data_layer.instrumentation import instrumented
+from data_layer.sketch import DistinctSketch, hash_values
+from data_layer.store import aligned_blocks, concat_blocks, load_row_block, prepare_blocks
+
+# --- Daily rollup behind the Overview page ----------------------------------------------------------------------
+# Rows are rolled up once per (day, service, direction). Distinct paths and users are kept as mergeable sketches
+# and the rest as sums and counts, so the KPIs, any time frame bucket and the per-service and per-direction
+# summaries are all merged from the rollup without re-reading rows or the warehouse. The rollup's size depends on
+# the number of days, not rows: no raw values are kept, and no chart shows the old MEDIAN/MAX fee measures.
+#
+# Transfer counts are summed per-group distinct ids: an id belongs to exactly one day, service and direction, as
+# token transfer and GMP ids never collide (the pages always counted them as one distinct set).
+# Sketches hash the normalized addresses, not address index ids: rollups are shared through the disk cache with
+# processes that may keep a different store, and so a different index.
+SKETCH_COLUMNS = {"paths": "path", "users": "user"}
+
+
+@instrumented
+def daily_rollup(df):
+    df = with_path(df)
+    df["Date"] = df["created_at"].dt.floor("D")
+    df["Direction"] = direction_of(df)
+    grouped = df.groupby(["Date", "service", "Direction"], sort=True, dropna=False, observed=True)
+    rollup = grouped.agg(
+        transfers=("id", "nunique"),
+        volume=("amount", "sum"),
+        fee_sum=("fee", "sum"),
+        fee_count=("fee", "count"),
+    )
+    # Hash each column once and split the hashes by group instead of hashing group by group
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(1, grouped.ngroups))
+
+    def split(values):
+        # np.split always returns at least one part, even when there are no groups
+        return np.split(values[order], bounds) if grouped.ngroups else []
+
+    for name, column in SKETCH_COLUMNS.items():
+        valid = df[column].notna().to_numpy()
+        hashes = np.zeros(len(df), dtype=np.uint64)
+        hashes[valid] = hash_values(df[column])
+        rollup[name] = [
+            DistinctSketch.from_hashes(part[keep])
+            for part, keep in zip(split(hashes), split(valid))
+        ]
+    return rollup.reset_index().rename(columns={"service": "Service"})
+
+
+def _distinct_count(sketches):
+    return DistinctSketch.union(sketches).count()
+
+
+MERGED_MEASURES = {
+    "Number of Path": ("paths", _distinct_count),
+    "User Count": ("users", _distinct_count),
+    "Transfer Count": ("transfers", "sum"),
+    "Transfer Volume": ("volume", "sum"),
+    "Transfer Fees": ("fee_sum", "sum"),
+    "fee_count": ("fee_count", "sum"),
+}
+
+
+def summarize(rollup, keys):
+    """Merge rollup rows per `keys` into the measures the old COUNT(DISTINCT)/SUM/AVG queries returned."""
+    if rollup.empty:
+        return pd.DataFrame()
+    if keys:
+        out = rollup.groupby(keys, sort=True, observed=True).agg(**MERGED_MEASURES).reset_index()
+    else:
+        out = pd.DataFrame(
+            {name: [rollup[column].agg(func)] for name, (column, func) in MERGED_MEASURES.items()}
+        )
+    out.insert(out.columns.get_loc("fee_count"), "Avg", out["Transfer Fees"] / out.pop("fee_count").replace(0, np.nan))
+    return out
+
+
+# --- Overview page ---------------------------------------------------------------------------------------------
+@instrumented
+def transfer_kpis(rollup):
+    out = summarize(rollup, [])
+    if out.empty:
+        return out
+    out = out[["Number of Path", "User Count", "Transfer Count", "Transfer Volume", "Transfer Fees", "Avg"]]
+    return out.round({"Transfer Volume": 0, "Transfer Fees": 0, "Avg": 2})
+
+
+@instrumented
+def rebucket(rollup, timeframe):
+    """Time series per `timeframe` bucket and service (same columns as the old time series query)."""
+    if rollup.empty:
+        return pd.DataFrame()
+    out = summarize(rollup.assign(Date=truncate_dates(rollup["Date"], timeframe)), ["Date", "Service"])
+    return out.round({"Transfer Volume": 0, "Transfer Fees": 1, "Avg": 2})
+
+
+@instrumented
+def transfer_summary_by_service(rollup):
+    out = summarize(rollup, ["Service"])
+    return out.round({"Transfer Volume": 1, "Transfer Fees": 1, "Avg": 2}) if not out.empty else out
+
+
+@instrumented
+def directional_transfer_summary(rollup):
+    out = summarize(rollup.dropna(subset=["Direction"]), ["Direction"])
+    if out.empty:
+        return out
+    out = out[["Direction", "User Count", "Transfer Count", "Transfer Volume", "Transfer Fees", "Avg"]]
+    return out.round({"Transfer Volume": 0, "Transfer Fees": 1, "Avg": 2})
+
+
+# Rollup rows are per day, so the rollup of a range is the concatenation of its aligned blocks' rollups
+@cached_loader
+def load_rollup_block(first, last):
+    return daily_rollup(load_row_block(first, last))
+
+
+@instrumented(kind="loader")
+def load_daily_rollup(start_date, end_date):
+    blocks = aligned_blocks(start_date, end_date)
+    prepare_blocks([block for block in blocks if not load_rollup_block.is_cached(*block)])
+    parts = [load_rollup_block(first, last) for first, last in blocks]
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return daily_rollup(concat_blocks([]))
+    return pd.concat(parts, ignore_index=True)
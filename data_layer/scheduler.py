@@ -0,0 +1,88 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from data_layer.cancellation import POLL_SECONDS, YieldPoint, cancel_scope
+
+# --- Parallel loader scheduler ----------------------------------------------------------------------------------
+# Independent warehouse queries are submitted together on a thread pool, so latency is the slowest query
+# rather than the sum of all of them. Worker threads inherit the Streamlit script context so cached functions
+# and session state keep working inside tasks, and each task runs in a copy of the submitter's context variables
+# so its queries are recorded in the caller's performance trace.
+#
+# The caller waits in short polls and yields to Streamlit in between, so a rerun or a closed session interrupts
+# the wait and cancels the tasks' queries (see `data_layer.cancellation`).
+DEFAULT_MAX_WORKERS = 8
+
+logger = logging.getLogger(__name__)
+
+
+def _attach_script_run_ctx(ctx):
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def run_parallel(tasks, max_workers=DEFAULT_MAX_WORKERS):
+    """Run `{name: (fn, *args)}` tasks concurrently and return `(results, timings)` keyed by name.
+
+    The first failing task cancels the ones that have not started yet and its exception is re-raised. An
+    interrupted wait cancels the running tasks' queries as well.
+    """
+    results, timings = {}, {}
+    if not tasks:
+        return results, timings
+
+    def timed(name, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[name] = time.perf_counter() - started
+
+    yield_point = YieldPoint()
+    # The scope is entered inside the executor so that, on the way out, queries are cancelled before the executor
+    # waits for its threads
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(tasks)),
+        thread_name_prefix="loader",
+        initializer=_attach_script_run_ctx,
+        initargs=(get_script_run_ctx(),),
+    ) as executor, cancel_scope():
+        futures = {
+            executor.submit(contextvars.copy_context().run, timed, name, *task): name for name, task in tasks.items()
+        }
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_EXCEPTION)
+                if any(future.exception() is not None for future in done):
+                    break
+                yield_point()
+        finally:
+            for future in pending:
+                future.cancel()
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+        for future, name in futures.items():
+            results[name] = future.result()
+
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        logger.info("%s took %.2fs", name, seconds)
+    return results, timings
+
+
+def start_background(name, fn, *args):
+    """Run `fn(*args)` on a daemon thread that outlives the current script run.
+
+    The thread gets neither the script context (Streamlit's per-run state must not be used after the run ends)
+    nor the caller's context variables: its queries are not recorded in the caller's trace and are not cancelled
+    with the caller's rerun.
+    """
+    thread = threading.Thread(target=contextvars.Context().run, args=(fn, *args), name=name, daemon=True)
+    thread.start()
+    return thread
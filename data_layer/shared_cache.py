@@ -0,0 +1,163 @@
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import streamlit as st
+
+from data_layer.config import setting
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, the cache still works but without single-flight
+    fcntl = None
+
+# --- Optional on-disk result cache shared by every process -------------------------------------------------------
+# Set `shared_cache_path` to a directory all Streamlit replicas can reach and the loaders' results are kept there
+# as well as in each process's memory, so one replica's warehouse queries serve all of them.
+#
+#   keys/<key hash>.json    which blob holds the result for a loader call, and when it expires
+#   blobs/<content hash>    the pickled result, zstd-compressed; equal results share one blob
+#   locks/<key hash>.lock   held while a result is computed, so other processes wait for it instead of repeating it
+#
+# The key hash includes CACHE_VERSION; bump it when a loader's output format changes.
+CACHE_VERSION = 4
+CODEC = pa.Codec("zstd")
+PRUNE_EVERY_PUTS = 50
+_HEADER = struct.Struct("<Q")
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on `path` (created if needed) for the duration of the block."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class SharedDiskCache:
+    def __init__(self, root):
+        self.root = Path(root)
+        for sub in ("keys", "blobs", "locks"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self._puts = 0
+
+    def key_hash(self, key):
+        return hashlib.sha256(repr((CACHE_VERSION, key)).encode()).hexdigest()
+
+    def _key_path(self, key):
+        return self.root / "keys" / f"{self.key_hash(key)}.json"
+
+    def lock(self, key):
+        """Single-flight lock for one key across threads and processes."""
+        return file_lock(self.root / "locks" / f"{self.key_hash(key)}.lock")
+
+    def named_lock(self, name):
+        return file_lock(self.root / "locks" / f"{name}.lock")
+
+    def _meta(self, key):
+        path = self._key_path(key)
+        try:
+            meta = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if meta["expires_at"] is not None and meta["expires_at"] <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return meta
+
+    def contains(self, key):
+        meta = self._meta(key)
+        return meta is not None and (self.root / "blobs" / meta["blob"]).exists()
+
+    def get(self, key):
+        """Return `(True, value, ttl_left)` for a fresh entry, else `(False, None, None)`."""
+        meta = self._meta(key)
+        if meta is None:
+            return False, None, None
+        try:
+            data = (self.root / "blobs" / meta["blob"]).read_bytes()
+        except FileNotFoundError:
+            return False, None, None
+        (size,) = _HEADER.unpack_from(data)
+        value = pickle.loads(CODEC.decompress(data[_HEADER.size:], decompressed_size=size, asbytes=True))
+        ttl_left = None if meta["expires_at"] is None else max(meta["expires_at"] - time.time(), 0)
+        return True, value, ttl_left
+
+    def put(self, key, value, ttl=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        blob = hashlib.sha256(payload).hexdigest()
+        blob_path = self.root / "blobs" / blob
+        try:
+            # Reusing a blob refreshes its mtime so a concurrent prune leaves it alone
+            os.utime(blob_path)
+        except FileNotFoundError:
+            _write_atomic(blob_path, _HEADER.pack(len(payload)) + CODEC.compress(payload, asbytes=True))
+        meta = {"blob": blob, "expires_at": None if ttl is None else time.time() + ttl}
+        _write_atomic(self._key_path(key), json.dumps(meta).encode())
+        self._puts += 1
+        if self._puts % PRUNE_EVERY_PUTS == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired keys and the blobs no key refers to any more."""
+        with file_lock(self.root / "locks" / "prune.lock"):
+            now, live = time.time(), set()
+            for path in (self.root / "keys").glob("*.json"):
+                try:
+                    meta = json.loads(path.read_text())
+                except (FileNotFoundError, ValueError):
+                    continue
+                if meta["expires_at"] is not None and meta["expires_at"] <= now:
+                    path.unlink(missing_ok=True)
+                else:
+                    live.add(meta["blob"])
+            for path in (self.root / "blobs").iterdir():
+                # Skip in-flight temporary files and blobs written after the key scan started
+                if path.name not in live and not path.name.endswith(".tmp") and path.stat().st_mtime < now:
+                    path.unlink(missing_ok=True)
+
+    def stats(self):
+        sizes = []
+        with os.scandir(self.root / "blobs") as entries:
+            for entry in entries:
+                with contextlib.suppress(FileNotFoundError):
+                    if not entry.name.endswith(".tmp"):
+                        sizes.append(entry.stat().st_size)
+        return {
+            "keys": sum(1 for _ in (self.root / "keys").glob("*.json")),
+            "blobs": len(sizes),
+            "bytes_on_disk": sum(sizes),
+        }
+
+
+@st.cache_resource
+def get_shared_cache():
+    """The shared cache, or None when `shared_cache_path` is not configured."""
+    root = setting("shared_cache_path", "")
+    return SharedDiskCache(root) if root else None
+
+
+def shared_lock(name):
+    """A lock named `name` held across every process using the shared cache; a no-op without one."""
+    shared = get_shared_cache()
+    return shared.named_lock(name) if shared is not None else contextlib.nullcontext()
@@ -0,0 +1,171 @@
+import re
+
+# --- SQL dialects -----------------------------------------------------------------------------------------------
+# The transfer queries are written once against these helpers and rendered for the warehouse (Snowflake VARIANT
+# paths) or for the embedded offline engine (DuckDB JSON functions).
+
+
+class Snowflake:
+    name = "snowflake"
+
+    def text(self, column, *keys):
+        """A VARIANT path as text, e.g. `TO_VARCHAR(data:send.amount)`."""
+        return f"TO_VARCHAR({column}:{'.'.join(keys)})"
+
+    def number(self, column, *keys):
+        return f"TRY_CAST({self.text(column, *keys)} AS FLOAT)"
+
+    def date(self, column):
+        return f"{column}::DATE"
+
+    def varchar(self, expression):
+        return f"TO_VARCHAR({expression})"
+
+    def param(self, name):
+        """Placeholder for the connector's default `pyformat` paramstyle."""
+        return f"%({name})s"
+
+
+class DuckDB:
+    name = "duckdb"
+
+    def text(self, column, *keys):
+        return f"json_extract_string({column}, '$.{'.'.join(keys)}')"
+
+    def number(self, column, *keys):
+        return f"TRY_CAST({self.text(column, *keys)} AS DOUBLE)"
+
+    def date(self, column):
+        return f"CAST({column} AS DATE)"
+
+    def varchar(self, expression):
+        return f"CAST({expression} AS VARCHAR)"
+
+    def param(self, name):
+        return f"${name}"
+
+
+DIALECTS = {dialect.name: dialect for dialect in (Snowflake(), DuckDB())}
+
+
+# --- Declarative query specs ------------------------------------------------------------------------------------
+# Queries are described as data and compiled to one canonical text per dialect: fixed clause order, single spaces,
+# upper-case keywords and bind parameters instead of interpolated values. The same logical query therefore sends
+# byte-identical text from every page and session, which is what Snowflake's result cache keys on.
+#
+# Expressions are callables taking a dialect and returning SQL text.
+def col(name):
+    return lambda d: name
+
+
+def raw(sql):
+    return lambda d: sql
+
+
+def literal(value):
+    if isinstance(value, str):
+        return lambda d: "'" + value.replace("'", "''") + "'"
+    return lambda d: repr(value)
+
+
+def param(name):
+    return lambda d: d.param(name)
+
+
+def text(column, *keys):
+    return lambda d: d.text(column, *keys)
+
+
+def number(column, *keys):
+    return lambda d: d.number(column, *keys)
+
+
+def date(column):
+    return lambda d: d.date(column)
+
+
+def varchar(expression):
+    return lambda d: d.varchar(expression(d))
+
+
+def lower(expression):
+    return lambda d: f"LOWER({expression(d)})"
+
+
+def coalesce(*expressions):
+    return lambda d: f"COALESCE({', '.join(e(d) for e in expressions)})"
+
+
+def product(*expressions):
+    return lambda d: " * ".join(e(d) for e in expressions)
+
+
+def eq(left, right):
+    return lambda d: f"{left(d)} = {right(d)}"
+
+
+def gt(left, right):
+    return lambda d: f"{left(d)} > {right(d)}"
+
+
+def between(expression, low, high):
+    return lambda d: f"{expression(d)} BETWEEN {low(d)} AND {high(d)}"
+
+
+def any_of(*conditions):
+    return lambda d: "(" + " OR ".join(c(d) for c in conditions) + ")"
+
+
+def _aliased(sql, name):
+    return sql if sql == name else f"{sql} AS {name}"
+
+
+class Select:
+    """`SELECT columns FROM source WHERE ... ORDER BY ... LIMIT n`.
+
+    `columns` maps output names to expressions (None selects `*`), `source` is a table name or another spec,
+    `where` conditions are AND-ed and `order_by` holds `(expression, descending)` pairs.
+    """
+
+    def __init__(self, source, columns=None, where=(), order_by=(), limit=None):
+        self.source = source
+        self.columns = columns
+        self.where = tuple(where)
+        self.order_by = tuple(order_by)
+        self.limit = limit
+
+    def render(self, d):
+        if self.columns is None:
+            columns = "*"
+        else:
+            columns = ", ".join(_aliased(expression(d), name) for name, expression in self.columns.items())
+        source = self.source if isinstance(self.source, str) else f"({self.source.render(d)})"
+        sql = f"SELECT {columns} FROM {source}"
+        if self.where:
+            sql += " WHERE " + " AND ".join(condition(d) for condition in self.where)
+        if self.order_by:
+            sql += " ORDER BY " + ", ".join(
+                f"{expression(d)} DESC" if descending else expression(d) for expression, descending in self.order_by
+            )
+        if self.limit is not None:
+            sql += f" LIMIT {int(self.limit)}"
+        return sql
+
+
+class UnionAll:
+    def __init__(self, *selects):
+        self.selects = selects
+
+    def render(self, d):
+        return " UNION ALL ".join(select.render(d) for select in self.selects)
+
+
+def normalize(sql):
+    """Collapse runs of whitespace outside string literals to single spaces."""
+    parts = sql.split("'")
+    parts[::2] = [re.sub(r"\s+", " ", part) for part in parts[::2]]
+    return "'".join(parts).strip()
+
+
+def compile_query(spec, dialect):
+    return normalize(spec.render(dialect))
@@ -0,0 +1,223 @@
+import datetime as dt
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from data_layer.backends import get_backend
+from data_layer.cache import cached_loader
+from data_layer.config import setting
+from data_layer.instrumentation import instrumented
+from data_layer.resilience import WarehouseUnavailable, resilient_call
+from data_layer.scheduler import run_parallel
+from data_layer.shared_cache import file_lock, shared_lock
+from data_layer.transfers import SERVICES, TRANSFER_COLUMNS, compact, concat_frames, conform
+
+# --- Local day-partitioned store of the flattened transfer rows -------------------------------------------------
+# Each calendar day of `axelar_services` rows lives in its own Parquet file. A request for a date range reads
+# the cached days and only asks the warehouse for days that are missing, plus a trailing window of recent days
+# that are re-fetched because late-arriving transfers may still land in them. A day stays open, and is re-fetched
+# when next requested, until its partition has been written after that window closed, so a day first fetched while
+# it was recent is completed however late it is requested again.
+#
+# Refreshes hold a file lock in the store directory as well, so replicas sharing one store fetch a stale day once:
+# the others wait, then find it written. An open day re-fetched less than `refetch_interval` seconds ago counts
+# as fresh. While the warehouse is unavailable, stale days that have a partition are served from it as they are.
+DEFAULT_STORE_PATH = ".cache/transfers"
+DEFAULT_REFETCH_DAYS = 2
+DEFAULT_REFETCH_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+
+def day_range(start_date, end_date):
+    return [d.date() for d in pd.date_range(start_date, end_date, freq="D")]
+
+
+def contiguous_runs(days):
+    """Group sorted days into (first, last) runs of consecutive days."""
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][1] == dt.timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+def aligned_blocks(start_date, end_date):
+    """Split a range into whole calendar months plus single edge days, as inclusive (first, last) pairs.
+
+    Any two ranges that overlap share every block they both fully contain, whatever their exact end points.
+    """
+    blocks = []
+    days = day_range(start_date, end_date)
+    i = 0
+    while i < len(days):
+        day = days[i]
+        month_end = (pd.Timestamp(day) + pd.offsets.MonthEnd(0)).date()
+        if day.day == 1 and month_end <= days[-1]:
+            blocks.append((day, month_end))
+            i += month_end.day
+        else:
+            blocks.append((day, day))
+            i += 1
+    return blocks
+
+
+class TransferStore:
+    def __init__(self, root=DEFAULT_STORE_PATH, refetch_days=DEFAULT_REFETCH_DAYS,
+                 refetch_interval=DEFAULT_REFETCH_INTERVAL):
+        self.root = Path(root)
+        self.refetch_days = refetch_days
+        self.refetch_interval = refetch_interval
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def partition_path(self, day):
+        return self.root / f"day={day:%Y-%m-%d}.parquet"
+
+    def is_cached(self, day):
+        return self.partition_path(day).exists()
+
+    def written_at(self, day):
+        """When the day's partition was last written, as a timestamp, or None if it is not cached."""
+        try:
+            return self.partition_path(day).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def stale_days(self, days):
+        """The given days that must be (re-)fetched from the warehouse.
+
+        A day is final once a write happened after its `refetch_days` window had passed; until then it is re-fetched
+        whenever its partition is older than `refetch_interval`, however long ago the day itself was.
+        """
+        now = time.time()
+        stale = []
+        for day in days:
+            written_at = self.written_at(day)
+            if written_at is None:
+                stale.append(day)
+                continue
+            final = dt.date.fromtimestamp(written_at) > day + dt.timedelta(days=self.refetch_days)
+            if not final and now - written_at >= self.refetch_interval:
+                stale.append(day)
+        return stale
+
+    @instrumented(name="store.refresh")
+    def refresh(self, days, fetch):
+        """Fetch every stale day with one query per contiguous run and service, in parallel, and persist it."""
+        with self._lock, file_lock(self.root / ".refresh.lock"):
+            self._refresh(sorted(set(days)), fetch)
+
+    def _refresh(self, days, fetch):
+        runs = contiguous_runs(self.stale_days(days))
+        tasks = {
+            f"{service} {first}..{last}": (fetch, first, last, service)
+            for first, last in runs
+            for service in SERVICES
+        }
+        try:
+            results, _ = run_parallel(tasks)
+        except WarehouseUnavailable as e:
+            if not all(self.is_cached(day) for first, last in runs for day in day_range(first, last)):
+                raise
+            logger.warning("Serving cached partitions for %s while the warehouse is unavailable: %s", runs, e)
+            return
+        for first, last in runs:
+            rows = [results[f"{service} {first}..{last}"] for service in SERVICES]
+            self.write(first, last, pd.concat(rows, ignore_index=True))
+
+    def write(self, first, last, rows):
+        rows = conform(rows)
+        by_day = dict(tuple(rows.groupby(rows["created_at"].dt.date, sort=False)))
+        for day in day_range(first, last):
+            # Empty days are written too, so they count as cached
+            part = by_day.get(day, rows.iloc[0:0])
+            path = self.partition_path(day)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            part.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+
+    @instrumented(name="store.read")
+    def read(self, start_date, end_date):
+        parts = [
+            pd.read_parquet(self.partition_path(day))
+            for day in day_range(start_date, end_date)
+            if self.is_cached(day)
+        ]
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return conform(pd.DataFrame(columns=TRANSFER_COLUMNS))
+        return pd.concat(parts, ignore_index=True)
+
+    def rows(self, start_date, end_date, fetch):
+        self.refresh(day_range(start_date, end_date), fetch)
+        return self.read(start_date, end_date)
+
+
+@st.cache_resource
+def get_store():
+    # Each backend gets its own partitions so offline fixtures never mix with warehouse rows
+    return TransferStore(
+        root=setting("store_path", os.path.join(DEFAULT_STORE_PATH, get_backend().name)),
+        refetch_days=setting("refetch_days", DEFAULT_REFETCH_DAYS),
+        refetch_interval=setting("refetch_interval", DEFAULT_REFETCH_INTERVAL),
+    )
+
+
+def fetch_from_warehouse(start_date, end_date, service):
+    return resilient_call(get_backend().fetch_transfers, start_date, end_date, service)
+
+
+# --- Shared row loader: every page aggregates from this frame --------------------------------------------------
+# Ranges are served as aligned blocks (see `aligned_blocks`), each cached on its own, so a selection that moves
+# by a day re-reads one edge day instead of the whole range. Blocks missing from the cache are refreshed from
+# the warehouse together, keeping one query per contiguous run of stale days. Blocks are cached in the compact
+# representation of `transfers.compact`.
+#
+# A block also refreshes its own days when it is computed, which is a no-op right after `prepare_blocks` and lets
+# a stale block be revalidated in the background on its own.
+#
+# The composed range frame is cached as well, per (start, end), so reruns of a page do not concatenate its blocks
+# again; pages read their aggregates through cached loaders too (see `aggregations`).
+#
+# With a shared cache, preparation is serialized across processes and the prepared blocks are published to it
+# before the lock is released, so replicas waiting on the same blocks load them instead of querying again.
+def prepare_blocks(blocks):
+    """Bring the store up to date for every block whose rows are not cached yet."""
+    if all(load_row_block.is_cached(*block) for block in blocks):
+        return
+    with shared_lock("prepare_blocks"):
+        missing = [block for block in blocks if not load_row_block.is_cached(*block)]
+        if missing:
+            days = [day for first, last in missing for day in day_range(first, last)]
+            get_store().refresh(days, fetch_from_warehouse)
+            for first, last in missing:
+                load_row_block(first, last)
+
+
+@cached_loader
+def load_row_block(first, last):
+    store = get_store()
+    store.refresh(day_range(first, last), fetch_from_warehouse)
+    return compact(store.read(first, last))
+
+
+def concat_blocks(frames):
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return conform(pd.DataFrame(columns=TRANSFER_COLUMNS))
+    return concat_frames(frames)
+
+
+@cached_loader
+def load_axelar_services(start_date, end_date):
+    blocks = aligned_blocks(start_date, end_date)
+    prepare_blocks(blocks)
+    return concat_blocks([load_row_block(first, last) for first, last in blocks])
@@ -0,0 +1,256 @@
+import contextlib
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+import snowflake.connector
+
+from data_layer.addresses import normalize_address_column, normalize_addresses
+from data_layer.cancellation import POLL_SECONDS, QueryCancelled, raise_if_cancelled, running_query, wait_cancelled
+from data_layer.instrumentation import record
+from data_layer.sql import (
+    Select,
+    any_of,
+    between,
+    coalesce,
+    col,
+    compile_query,
+    date,
+    eq,
+    gt,
+    literal,
+    lower,
+    number,
+    param,
+    product,
+    text,
+    varchar,
+)
+
+# --- Row-level fetch of the flattened `axelar_services` union --------------------------------------------------
+# One row per executed Filecoin transfer (Token Transfers + GMP). Every page aggregates these rows locally,
+# so the VARIANT `data` column is scanned and parsed once per date range instead of once per chart.
+TRANSFER_COLUMNS = [
+    "created_at",
+    "source_chain",
+    "destination_chain",
+    "user",
+    "amount",
+    "fee",
+    "id",
+    "service",
+    "asset",
+]
+STRING_COLUMNS = ["source_chain", "destination_chain", "user", "id", "service", "asset"]
+FLOAT_COLUMNS = ["amount", "fee"]
+
+SERVICES = ("Token Transfers", "GMP")
+
+
+# The two halves of the `axelar_services` UNION ALL, fetched as separate statements so they can run in parallel.
+# Both select the canonical columns in the same order; dates are bound as `start_date` / `end_date` parameters.
+IN_DATE_RANGE = between(date("created_at"), param("start_date"), param("end_date"))
+EXECUTED = (eq(col("status"), literal("executed")), eq(col("simplified_status"), literal("received")))
+TRANSFER_TOUCHES_FILECOIN = any_of(
+    eq(text("data", "send", "original_source_chain"), literal("filecoin")),
+    eq(text("data", "send", "original_destination_chain"), literal("filecoin")),
+)
+GMP_TOUCHES_FILECOIN = any_of(
+    eq(text("data", "call", "chain"), literal("filecoin")),
+    eq(text("data", "call", "returnValues", "destinationChain"), literal("filecoin")),
+)
+
+SERVICE_SPECS = {
+    "Token Transfers": Select(
+        "axelar.axelscan.fact_transfers",
+        columns={
+            "created_at": col("created_at"),
+            "source_chain": lower(text("data", "send", "original_source_chain")),
+            "destination_chain": lower(text("data", "send", "original_destination_chain")),
+            "user": varchar(col("sender_address")),
+            "amount": product(number("data", "send", "amount"), number("data", "link", "price")),
+            "fee": number("data", "send", "fee_value"),
+            "id": varchar(col("id")),
+            "service": literal("Token Transfers"),
+            "asset": text("data", "link", "asset"),
+        },
+        where=(TRANSFER_TOUCHES_FILECOIN, IN_DATE_RANGE, *EXECUTED),
+    ),
+    "GMP": Select(
+        "axelar.axelscan.fact_gmp",
+        columns={
+            "created_at": col("created_at"),
+            "source_chain": lower(text("data", "call", "chain")),
+            "destination_chain": lower(text("data", "call", "returnValues", "destinationChain")),
+            "user": text("data", "call", "transaction", "from"),
+            "amount": number("data", "value"),
+            "fee": coalesce(
+                product(
+                    number("data", "gas", "gas_used_amount"),
+                    number("data", "gas_price_rate", "source_token", "token_price", "usd"),
+                ),
+                number("data", "fees", "express_fee_usd"),
+            ),
+            "id": varchar(col("id")),
+            "service": literal("GMP"),
+            "asset": text("data", "approved", "returnValues", "symbol"),
+        },
+        where=(GMP_TOUCHES_FILECOIN, IN_DATE_RANGE, *EXECUTED),
+    ),
+}
+
+
+def service_spec(service):
+    try:
+        return SERVICE_SPECS[service]
+    except KeyError:
+        raise ValueError(f"Unknown service: {service}") from None
+
+
+@functools.lru_cache(maxsize=None)
+def service_query(service, dialect):
+    return compile_query(service_spec(service), dialect)
+
+
+# The live tail's variant: a service's newest transfers created after the `since` watermark instead of a date range
+CREATED_SINCE = gt(col("created_at"), param("since"))
+
+
+def tail_spec(service, limit):
+    spec = service_spec(service)
+    return Select(
+        spec.source,
+        columns=spec.columns,
+        where=(*(condition for condition in spec.where if condition is not IN_DATE_RANGE), CREATED_SINCE),
+        order_by=((col("created_at"), True),),
+        limit=limit,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def tail_query(service, dialect, limit):
+    return compile_query(tail_spec(service, limit), dialect)
+
+
+def date_params(start_date, end_date):
+    """Bind values for `start_date` / `end_date`, normalized so equal ranges bind identical values."""
+    return {"start_date": pd.Timestamp(start_date).date(), "end_date": pd.Timestamp(end_date).date()}
+
+
+def execute_cancellable(conn, cursor, query, params=None):
+    """Submit a query asynchronously and wait for it, aborting it on the warehouse if the caller is cancelled.
+
+    The query stays registered under the session while it runs. On return its results are attached to `cursor`.
+    """
+    raise_if_cancelled()
+    cursor.execute_async(query, params)
+    query_id = cursor.sfqid
+    finished = False
+    with running_query(query_id, lambda: cursor.abort_query(query_id)):
+        try:
+            delay = 0.05
+            while conn.is_still_running(conn.get_query_status_throw_if_error(query_id)):
+                if wait_cancelled(delay):
+                    raise QueryCancelled(query_id)
+                delay = min(delay * 2, POLL_SECONDS)
+            finished = True
+        finally:
+            if not finished:
+                with contextlib.suppress(Exception):
+                    cursor.abort_query(query_id)
+    cursor.get_results_from_sfqid(query_id)
+    return query_id
+
+
+def fetch_frame(conn, query, params=None, label="query"):
+    """Run a query and decode its result from Arrow batches instead of row-by-row DB-API tuples.
+
+    Records the query id and its execute, fetch and decode times in the active trace under `label`.
+    """
+    started = time.perf_counter()
+    with conn.cursor() as cursor:
+        query_id = execute_cancellable(conn, cursor, query, params)
+        executed = time.perf_counter()
+        columns = [column.name for column in cursor.description]
+        try:
+            table = cursor.fetch_arrow_all(force_return_table=True)
+            fetched = time.perf_counter()
+            df, nbytes = table.to_pandas(), table.nbytes
+        except snowflake.connector.errors.NotSupportedError:
+            # Result was not served in Arrow format (e.g. a JSON result set)
+            rows = cursor.fetchall()
+            fetched = time.perf_counter()
+            df, nbytes = pd.DataFrame(rows, columns=columns), None
+        decoded = time.perf_counter()
+    if df.columns.empty:
+        df = pd.DataFrame(columns=columns)
+    record(
+        "query",
+        label,
+        started,
+        query_id=query_id,
+        execute_ms=(executed - started) * 1000,
+        fetch_ms=(fetched - executed) * 1000,
+        decode_ms=(decoded - fetched) * 1000,
+        rows=len(df),
+        bytes=nbytes,
+    )
+    return df
+
+
+def conform(df):
+    """Coerce a transfer frame to the canonical column order and explicit dtypes, with normalized addresses."""
+    df = df[TRANSFER_COLUMNS].copy()
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    for column in STRING_COLUMNS:
+        df[column] = df[column].astype(object)
+    df["user"] = normalize_addresses(df["user"]).to_numpy()
+    for column in FLOAT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    return df
+
+
+# --- Compact in-memory representation of cached rows -------------------------------------------------------------
+# Chains, services and assets take a handful of values and addresses repeat across a user's transfers, so cached
+# frames keep these columns as categoricals: integer codes plus one dictionary of the column's distinct values per
+# frame, which also travels with the frame when it is pickled into the shared cache. Transfer ids are unique and
+# kept as Arrow strings. Amounts and fees stay float64: they are summed, and float32 would change the totals.
+CATEGORY_COLUMNS = ["source_chain", "destination_chain", "user", "service", "asset"]
+ID_DTYPE = "string[pyarrow]"
+
+
+def compact(df):
+    """A conformed transfer frame with its repeated strings as categoricals and ids as Arrow strings."""
+    df = df.copy(deep=False)
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+    # Partitions written before addresses were normalized on conform
+    df["user"] = normalize_address_column(df["user"])
+    df["id"] = df["id"].astype(ID_DTYPE)
+    return df
+
+
+def concat_categoricals(columns):
+    """Concatenate categorical Series into one categorical over the sorted union of their categories."""
+    categories = pd.Index(np.concatenate([column.cat.categories.to_numpy() for column in columns])).unique()
+    categories = categories.sort_values()
+    codes = []
+    for column in columns:
+        recode = np.append(categories.get_indexer(column.cat.categories), -1).astype(np.int32)
+        # Code -1 (missing) indexes the appended -1 and stays missing
+        codes.append(recode[column.cat.codes.to_numpy()])
+    return pd.Categorical.from_codes(np.concatenate(codes), categories)
+
+
+def concat_frames(frames):
+    """`pd.concat` that keeps categorical columns categorical when the frames' categories differ."""
+    frames = list(frames)
+    categorical = [
+        column for column in frames[0].columns
+        if all(isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    out = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for column in categorical:
+        out[column] = concat_categoricals([frame[column] for frame in frames])
+    return out[frames[0].columns]
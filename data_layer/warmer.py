@@ -0,0 +1,138 @@
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from data_layer import aggregations, explorer
+from data_layer.cache import revalidating
+from data_layer.config import setting
+from data_layer.lookup import load_transfer_index
+from data_layer.rollups import load_daily_rollup
+from data_layer.scheduler import start_background
+
+# --- Background cache warmer ------------------------------------------------------------------------------------
+# When the process serves its first page, a background thread loads the pages' default range and the most
+# requested ranges through the same loaders the pages use, then repeats every `warm_interval` seconds (0 warms
+# once), so visitors find those results cached instead of waiting on the warehouse.
+#
+# Pages report the range they render with `note_range`. The counts are saved to `warm_ranges_path` after each
+# pass, so the popular ranges of the previous process are warmed right after a deploy.
+DEFAULT_START_DATE = dt.date(2024, 1, 1)
+DEFAULT_END_DATE = dt.date(2025, 7, 31)
+DEFAULT_WARM_INTERVAL = 900
+DEFAULT_WARM_POPULAR = 5
+DEFAULT_RANGES_PATH = ".cache/popular_ranges.json"
+# Only this many of the most requested ranges are kept between passes
+MAX_TRACKED_RANGES = 100
+# The loaders the pages render from, with the arguments they pass after the range: the overview reads the daily
+# rollup, the wallet lookup the transfer index, the other pages their aggregates of the transfer rows, and the
+# Monitoring page's explorer opens on its first page of all services (keyed as the page asks for it)
+WARM_LOADERS = [
+    (load_daily_rollup, ()),
+    (aggregations.load_transfer_paths_table, ()),
+    (aggregations.load_chain_distribution, ()),
+    (aggregations.load_whale_transfers, ()),
+    (aggregations.load_user_ranking, ()),
+    (load_transfer_index, ()),
+    (explorer.load_transfer_page, (None, None)),
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _as_date(value):
+    return pd.Timestamp(value).date()
+
+
+class CacheWarmer:
+    def __init__(self, path=DEFAULT_RANGES_PATH, interval=DEFAULT_WARM_INTERVAL, popular=DEFAULT_WARM_POPULAR):
+        self.path = Path(path)
+        self.interval = interval
+        self.popular = popular
+        self.requests = Counter(self._load())
+        self.last_pass = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self):
+        try:
+            saved = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {(_as_date(start), _as_date(end)): count for start, end, count in saved}
+
+    def _save(self):
+        with self._lock:
+            top = self.requests.most_common(MAX_TRACKED_RANGES)
+            self.requests = Counter(dict(top))
+        saved = [[start.isoformat(), end.isoformat(), count] for (start, end), count in top]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(saved))
+        os.replace(tmp, self.path)
+
+    def note(self, start_date, end_date):
+        with self._lock:
+            self.requests[(_as_date(start_date), _as_date(end_date))] += 1
+
+    def ranges(self):
+        """The default range followed by the most requested other ranges."""
+        default = (DEFAULT_START_DATE, DEFAULT_END_DATE)
+        with self._lock:
+            popular = [rng for rng, _ in self.requests.most_common(self.popular + 1) if rng != default]
+        return [default, *popular[:self.popular]]
+
+    def warm(self):
+        """Load every warmed range once, computing expired results rather than serving them stale."""
+        started = time.perf_counter()
+        ranges = self.ranges()
+        with revalidating():
+            for start_date, end_date in ranges:
+                for loader, args in WARM_LOADERS:
+                    try:
+                        loader(start_date, end_date, *args)
+                    except Exception:
+                        logger.warning("Warming %s(%s, %s) failed", loader.__name__, start_date, end_date,
+                                       exc_info=True)
+        self.last_pass = {"finished": time.time(), "ranges": len(ranges), "seconds": time.perf_counter() - started}
+        logger.info("Warmed %d ranges in %.1fs", len(ranges), self.last_pass["seconds"])
+        try:
+            self._save()
+        except OSError:
+            logger.warning("Could not save the requested ranges to %s", self.path, exc_info=True)
+
+    def _run(self):
+        while True:
+            self.warm()
+            if not self.interval:
+                return
+            time.sleep(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = start_background("cache-warmer", self._run)
+
+
+@st.cache_resource
+def get_warmer():
+    """The process's warmer, started on first use unless `warm_cache` is off."""
+    warmer = CacheWarmer(
+        path=setting("warm_ranges_path", DEFAULT_RANGES_PATH),
+        interval=setting("warm_interval", DEFAULT_WARM_INTERVAL),
+        popular=setting("warm_popular", DEFAULT_WARM_POPULAR),
+    )
+    if setting("warm_cache", True):
+        warmer.start()
+    return warmer
+
+
+def note_range(start_date, end_date):
+    """Count a page's selected range toward the popular ranges the warmer keeps cached."""
+    get_warmer().note(start_date, end_date)
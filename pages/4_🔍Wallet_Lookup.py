@@ -0,0 +1,108 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from data_layer import aggregations, instrumentation, warmer
+from data_layer.lookup import load_transfer_index
+from data_layer.resilience import WarehouseUnavailable, unavailable_message
+
+# --- Page Config: Tab Title & Icon ---
+st.set_page_config(
+    page_title="Connecting Filecoin VM to any Blockchain via Axelar",
+    page_icon="https://pbs.twimg.com/profile_images/1869486848646537216/rs71wCQo_400x400.jpg",
+    layout="wide"
+)
+instrumentation.start_trace()
+
+st.title("🔍Wallet Lookup")
+
+st.info(
+    "🔎Enter a wallet address to see its full cross-chain history, or a transfer ID to see that transfer. Lookups search the selected time range."
+)
+
+# --- Time Frame & Period Selection ---
+timeframe = st.selectbox("Select Time Frame", ["month", "week", "day"])
+start_date = st.date_input("Start Date", value=warmer.DEFAULT_START_DATE)
+end_date = st.date_input("End Date", value=warmer.DEFAULT_END_DATE)
+warmer.note_range(start_date, end_date)
+
+# --- Load Data: the range's rows, indexed by sender and transfer ID once and then answered locally ---
+try:
+    transfer_index = load_transfer_index(start_date, end_date)
+except WarehouseUnavailable as e:
+    st.error(unavailable_message(e))
+    st.stop()
+
+
+# --- Wallet drill-down: totals, activity, paths and full history of one sender's transfers ---
+def render_wallet(rows):
+    # --- Row 1: Wallet KPI Metrics ----------------------------------------------------------------------------------
+    summary = aggregations.wallet_summary(rows)
+    st.markdown(
+        """
+        <div style="background-color:#0090ff; padding:1px; border-radius:10px;">
+            <h2 style="color:#000000; text-align:center;">👛Wallet Overview</h2>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="💸 Volume of Transfers", value=f"{summary['Transfer Volume']:,.0f} USD")
+    with col2:
+        st.metric(label="🚀 Number of Transfers", value=f"{summary['Transfer Count']:,} Txns")
+    with col3:
+        st.metric(label="⛽ Total Transfer Fees", value=f"{summary['Transfer Fees']:,.2f} USD")
+
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        st.metric(label="🔀 Number of Paths", value=f"{summary['Number of Paths']} Paths")
+    with col5:
+        st.metric(label="⏰ First Transfer", value=f"{summary['First Transfer']:%Y-%m-%d}")
+    with col6:
+        st.metric(label="⏰ Last Transfer", value=f"{summary['Last Transfer']:%Y-%m-%d}")
+
+    # --- Row 2: Activity Over Time & Paths --------------------------------------------------------------------------
+    activity_df = aggregations.wallet_activity(rows, timeframe)
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_volume = px.bar(
+            activity_df, x="Date", y="Transfer Volume", color="Path", title="Transfer Volume Over Time"
+        )
+        fig_volume.update_layout(xaxis_title="", yaxis_title="$USD", barmode="stack")
+        st.plotly_chart(fig_volume, use_container_width=True)
+    with col2:
+        fig_count = px.bar(
+            activity_df, x="Date", y="Transfer Count", color="Path", title="Transfer Count Over Time"
+        )
+        fig_count.update_layout(xaxis_title="", yaxis_title="Txns count", barmode="stack")
+        st.plotly_chart(fig_count, use_container_width=True)
+
+    st.markdown("### 🔀 Paths")
+    st.dataframe(aggregations.wallet_paths(rows), hide_index=True)
+
+    # --- Row 3: Full History ----------------------------------------------------------------------------------------
+    st.markdown("### 📋 Transfer History")
+    st.dataframe(aggregations.transfer_rows(rows), hide_index=True)
+
+
+query = st.text_input("Wallet address or transfer ID", placeholder="0x...").strip()
+if not query:
+    st.caption(f"{len(transfer_index.addresses):,} wallets and {len(transfer_index):,} transfers in the selected range.")
+else:
+    kind, rows = transfer_index.find(query)
+    if kind is None:
+        st.warning("No wallet or transfer ID matches this in the selected period.")
+    elif kind == "transfer":
+        st.markdown("### ⛓ Transfer")
+        st.dataframe(aggregations.transfer_rows(rows), hide_index=True)
+        # Drill into the sender's history
+        sender = rows["user"].iloc[0]
+        if not pd.isna(sender):
+            st.caption(f"Sent by {sender}")
+            render_wallet(transfer_index.wallet(sender))
+    else:
+        render_wallet(rows)
+
+# --- Developer performance panel (open the page with ?perf=1) ---
+instrumentation.render_perf_panel()
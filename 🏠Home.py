@@ -1,11 +1,15 @@
 import streamlit as st
 
+from data_layer.warmer import get_warmer
+
 # --- Page Config: Tab Title & Icon ---
 st.set_page_config(
     page_title="Connecting Filecoin VM to any Blockchain via Axelar",
     page_icon="https://pbs.twimg.com/profile_images/1869486848646537216/rs71wCQo_400x400.jpg",
     layout="wide"
 )
+# Starts warming the other pages' caches in the background on the first visit
+get_warmer()
 
 # --- Title with Logo ---
 st.markdown(